@@ -12,6 +12,7 @@ from .utils.logging import get_logger
 logger = get_logger(__name__)
 
 ImgKey = Tuple[str, Path]  # (dataset_id, image_path)
+SelectedImage = Tuple[str, Path, str]  # (dataset_id, image_path, source_split)
 
 @dataclass
 class EdgeGroup:
@@ -135,3 +136,13 @@ def select_with_quotas(plan: MergePlan, per_target: Dict[int, List[EdgeGroup]])
         preview_edges=preview_edges,
         warnings=warnings
     )
+
+def flatten_selection(sources, selected: Set[ImgKey]) -> List[SelectedImage]:
+    """Freeze a selection into a flat (dataset_id, image, split) list, in source order."""
+    flat: List[SelectedImage] = []
+    for ds in sources:
+        for split, imgs in ds.repo.splits_map.items():
+            for img in imgs:
+                if (ds.id, img) in selected:
+                    flat.append((ds.id, img, split))
+    return flat
@@ -1,9 +1,10 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import Iterable, Set, Tuple
+from typing import Iterable, Sequence, Set, Tuple
 import yaml
 
 from .merge_model import MergePlan, SplitStrategy, CopyMode, CollisionPolicy
+from .merge_selector import SelectedImage
 from .yolo_io import parse_label_file, save_label_file
 from .fsops import hardlink_or_copy, resolve_collision_name, safe_mkdirs
 from .progress import Progress, ProgressCallback, CancelToken
@@ -23,66 +24,80 @@ def _dst_split_name(plan: MergePlan, source_split: str) -> str:
     if norm == "test":  return plan.target_test_name
     return plan.target_train_name
 
+def _copy_image(plan: MergePlan, ds_id: str, repo, img: Path, dst_split: str):
+    out_root = plan.output_dir
+    rows = parse_label_file(repo.label_path_for(img))
+    mapped_rows = []
+    for (cls, x, y, w, h) in rows:
+        tgt = plan.mapping.get((ds_id, cls), None)
+        if tgt is None:
+            logger.debug(f"Skipping unmapped class {cls} in {img}")
+            continue
+        mapped_rows.append((tgt, x, y, w, h))
+    logger.debug(f"Image {img}: {len(rows)} boxes -> {len(mapped_rows)} mapped")
+
+    if plan.drop_empty_images and not mapped_rows:
+        return
+
+    dst_img = out_root / dst_split / "images" / img.name
+    safe_mkdirs(dst_img.parent)
+    if plan.collision_policy == CollisionPolicy.RENAME and dst_img.exists():
+        dst_img = resolve_collision_name(dst_img, img, ds_id)
+    elif plan.collision_policy == CollisionPolicy.SUBDIRS:
+        dst_img = out_root / dst_split / "images" / ds_id / img.name
+        safe_mkdirs(dst_img.parent)
+
+    dst_lbl = out_root / dst_split / "labels" / (dst_img.stem + ".txt")
+    safe_mkdirs(dst_lbl.parent)
+
+    hardlink_or_copy(img, dst_img, prefer_hardlink=(plan.copy_mode == CopyMode.HARDLINK))
+    save_label_file(dst_lbl, mapped_rows)
+
 def merge_execute(
     plan: MergePlan,
     sources: Iterable,                 
     progress_cb: ProgressCallback | None = None,
     cancel: CancelToken | None = None,
     selection: Set[ImgKey] | None = None, 
+    items: Sequence[SelectedImage] | None = None,
 ):
+    """
+    Copy images and remapped labels into plan.output_dir. `items` (see
+    merge_selector.flatten_selection) is walked directly; otherwise every source
+    image is visited and filtered by `selection`.
+    """
     out_root = plan.output_dir
     for split in (plan.target_train_name, plan.target_val_name, plan.target_test_name):
         safe_mkdirs(out_root / split / "images")
         safe_mkdirs(out_root / split / "labels")
 
     logger.info(f"Merge plan mapping: {plan.mapping}")
-    total = sum(len(ds.repo.list_images()) for ds in sources)
-    logger.info(f"Total images to process: {total}")
-    prog = Progress(total=total)
+    if items is not None:
+        repos = {ds.id: ds.repo for ds in sources}
+        logger.info(f"Total images to process: {len(items)}")
+        prog = Progress(total=len(items))
+        for ds_id, img, split in items:
+            if cancel and cancel.is_cancelled():
+                return
+            _copy_image(plan, ds_id, repos[ds_id], img, _dst_split_name(plan, split))
+            prog.step()
+            if progress_cb: progress_cb(prog)
+    else:
+        total = sum(len(ds.repo.list_images()) for ds in sources)
+        logger.info(f"Total images to process: {total}")
+        prog = Progress(total=total)
 
-    for ds in sources:
-        repo = ds.repo
-        for split, imgs in repo.splits_map.items():
-            dst_split = _dst_split_name(plan, split)
-            for img in imgs:
-                if cancel and cancel.is_cancelled():
-                    return
-                if selection is not None and (ds.id, img) not in selection:
-                    prog.step(); 
-                    if progress_cb: progress_cb(prog)
-                    continue
-
-                rows = parse_label_file(repo.label_path_for(img))
-                mapped_rows = []
-                for (cls, x, y, w, h) in rows:
-                    tgt = plan.mapping.get((ds.id, cls), None)
-                    if tgt is None:
-                        logger.debug(f"Skipping unmapped class {cls} in {img}")
-                        continue
-                    mapped_rows.append((tgt, x, y, w, h))
-                logger.debug(f"Image {img}: {len(rows)} boxes -> {len(mapped_rows)} mapped")
-
-                if plan.drop_empty_images and not mapped_rows:
+        for ds in sources:
+            repo = ds.repo
+            for split, imgs in repo.splits_map.items():
+                dst_split = _dst_split_name(plan, split)
+                for img in imgs:
+                    if cancel and cancel.is_cancelled():
+                        return
+                    if selection is None or (ds.id, img) in selection:
+                        _copy_image(plan, ds.id, repo, img, dst_split)
                     prog.step()
                     if progress_cb: progress_cb(prog)
-                    continue
-
-                dst_img = out_root / dst_split / "images" / img.name
-                safe_mkdirs(dst_img.parent)
-                if plan.collision_policy == CollisionPolicy.RENAME and dst_img.exists():
-                    dst_img = resolve_collision_name(dst_img, img, ds.id)
-                elif plan.collision_policy == CollisionPolicy.SUBDIRS:
-                    dst_img = out_root / dst_split / "images" / ds.id / img.name
-                    safe_mkdirs(dst_img.parent)
-
-                dst_lbl = out_root / dst_split / "labels" / (dst_img.stem + ".txt")
-                safe_mkdirs(dst_lbl.parent)
-
-                hardlink_or_copy(img, dst_img, prefer_hardlink=(plan.copy_mode == CopyMode.HARDLINK))
-                save_label_file(dst_lbl, mapped_rows)
-
-                prog.step()
-                if progress_cb: progress_cb(prog)
 
     names = [tc.name for tc in plan.target_classes]
     yaml_obj = {
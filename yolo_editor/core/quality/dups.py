@@ -1,26 +1,43 @@
 from __future__ import annotations
-from pathlib import Path
-from PIL import Image
-import imagehash
+import cv2
+import numpy as np
+import scipy.fft
+from typing import List
 import logging
 
 logger = logging.getLogger(__name__)
 
-def phash_hex(path: Path) -> str:
-    """Generate perceptual hash for an image."""
-    try:
-        with Image.open(path) as im:
-            return str(imagehash.phash(im))
-    except Exception as e:
-        logger.warning(f"Failed to generate phash for {path}: {e}")
-        return ""
+# Perceptual hashes are 64-bit ints; NO_PHASH marks an image that could not be hashed.
+NO_PHASH = -1
 
-def too_similar(h1: str, h2: str, max_dist: int = 6) -> bool:
-    """Check if two hashes are too similar."""
+def phash_thumbnail(img_bgr, out=None):
+    """
+    32x32 grayscale thumbnail the pHash DCT runs on, or None if the image is empty.
+    If `out` (a float32 32x32 view, e.g. one slot of a preallocated batch) is given,
+    the thumbnail is written into it and returned.
+    """
     try:
-        if not h1 or not h2:
-            return False
-        return imagehash.hex_to_hash(h1) - imagehash.hex_to_hash(h2) <= max_dist
+        if img_bgr is None or img_bgr.size == 0:
+            return None
+        gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
+        small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA)
+        if out is None:
+            return small
+        out[...] = small  # cv2.resize cannot change dtype, so convert on the copy into the batch
+        return out
     except Exception as e:
-        logger.warning(f"Failed to compare hashes {h1} and {h2}: {e}")
-        return False
+        logger.warning(f"Failed to build phash thumbnail: {e}")
+        return None
+
+def phash_batch(thumbs) -> List[int]:
+    """
+    Perceptual hashes for an (N, 32, 32) stack of thumbnails using one batched 2D DCT.
+    A float32 ndarray is used as-is, without copying.
+    """
+    arr = np.asarray(thumbs, dtype=np.float32)
+    if arr.shape[0] == 0:
+        return []
+    dct2 = scipy.fft.dctn(arr, type=2, axes=(1, 2), norm="ortho", workers=-1)
+    block = dct2[:, :8, :8].reshape(arr.shape[0], 64)
+    bits = block > np.median(block, axis=1, keepdims=True)
+    return np.packbits(bits, axis=1).view(">u8").ravel().tolist()
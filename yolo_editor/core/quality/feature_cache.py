@@ -0,0 +1,178 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+import logging
+import sqlite3
+import time
+
+from ..utils.paths import default_config_dir
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, int, int]  # (path, mtime_ns, size)
+
+DEFAULT_DB_PATH = default_config_dir() / "phash.sqlite"
+
+# Bump whenever the way features are computed changes so stale rows are dropped.
+SCHEMA_VERSION = 1
+
+# Rows not read or written for this long are dropped the first time a cache is opened.
+MAX_AGE_DAYS = 90
+
+# Paths per SELECT ... IN (...) query; stays under SQLite's bound-parameter limit.
+_QUERY_CHUNK = 500
+
+# SQLite integers are signed 64-bit, so pHashes with the top bit set are stored wrapped.
+# -1 (NO_PHASH) passes through unchanged: a real pHash never has all 64 bits set.
+def _phash_to_sql(h: Optional[int]) -> Optional[int]:
+    return h - (1 << 64) if h is not None and h >= (1 << 63) else h
+
+def _phash_from_sql(v: Optional[int]) -> Optional[int]:
+    return v + (1 << 64) if v is not None and v < -1 else v
+
+@dataclass
+class ImageFeatures:
+    """
+    Per-image filter inputs. Fields stay None until they have been computed; the quality
+    checks stop at the first failing one, so the missing fields record where it was rejected.
+    """
+    phash: Optional[int] = None
+    blur: Optional[float] = None
+    expo: Optional[float] = None
+    w: Optional[int] = None
+    h: Optional[int] = None
+
+class FeatureCache:
+    """
+    pHash/quality cache keyed by (path, mtime, size), persisted to SQLite across runs.
+    Rows are read per path on demand (see load); each path keeps only its latest version,
+    and rows unused for MAX_AGE_DAYS are pruned when the cache is first opened.
+    """
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH, max_age_days: Optional[int] = MAX_AGE_DAYS):
+        self.db_path = Path(db_path)
+        self.max_age_days = max_age_days
+        self._rows: Dict[CacheKey, ImageFeatures] = {}
+        self._dirty: Dict[CacheKey, ImageFeatures] = {}
+        self._touched: Set[CacheKey] = set()  # rows read since the last flush; their use time is bumped
+        self._queried: Set[str] = set()       # paths whose rows have been fetched from disk
+        self._pruned = False
+
+    @staticmethod
+    def key_for(path: Path) -> Optional[CacheKey]:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return (str(path), st.st_mtime_ns, st.st_size)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        con = sqlite3.connect(str(self.db_path))
+        if con.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            con.execute("DROP TABLE IF EXISTS features")
+            con.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        con.execute(
+            "CREATE TABLE IF NOT EXISTS features ("
+            "path TEXT, mtime INTEGER, size INTEGER, phash INTEGER, blur REAL, expo REAL, w INTEGER, h INTEGER, "
+            "used INTEGER, PRIMARY KEY(path, mtime, size))"
+        )
+        con.execute("CREATE INDEX IF NOT EXISTS features_used ON features(used)")
+        if not self._pruned:
+            self._pruned = True
+            if self.max_age_days is not None:
+                self._prune(con, self.max_age_days)
+        return con
+
+    @staticmethod
+    def _prune(con: sqlite3.Connection, max_age_days: int) -> int:
+        cutoff = int(time.time()) - max_age_days * 86400
+        with con:
+            n = con.execute("DELETE FROM features WHERE used < ?", (cutoff,)).rowcount
+        if n:
+            logger.info(f"Pruned {n} feature cache rows unused for {max_age_days} days")
+        return n
+
+    def prune(self, max_age_days: int = MAX_AGE_DAYS) -> int:
+        """Drop rows not read or written in the last `max_age_days`; returns how many were removed."""
+        try:
+            con = self._connect()
+            try:
+                return self._prune(con, max_age_days)
+            finally:
+                con.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to prune feature cache {self.db_path}: {e}")
+            return 0
+
+    def load(self, paths: Iterable[str]):
+        """Fetch the cached rows for `paths` that have not been queried yet, in a few batched SELECTs."""
+        todo = [p for p in dict.fromkeys(paths) if p not in self._queried]
+        if not todo:
+            return
+        self._queried.update(todo)
+        try:
+            con = self._connect()
+            try:
+                for i in range(0, len(todo), _QUERY_CHUNK):
+                    chunk = todo[i:i + _QUERY_CHUNK]
+                    marks = ",".join("?" * len(chunk))
+                    for path, mtime, size, phash, blur, expo, w, h in con.execute(
+                            f"SELECT path, mtime, size, phash, blur, expo, w, h FROM features WHERE path IN ({marks})", chunk):
+                        self._rows.setdefault((path, mtime, size), ImageFeatures(_phash_from_sql(phash), blur, expo, w, h))
+            finally:
+                con.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read feature cache {self.db_path}: {e}")
+
+    def get(self, key: CacheKey) -> Optional[ImageFeatures]:
+        self.load((key[0],))
+        feats = self._rows.get(key)
+        if feats is not None and key not in self._dirty:
+            self._touched.add(key)
+        return feats
+
+    def put(self, key: CacheKey, feats: ImageFeatures):
+        self._queried.add(key[0])
+        self._rows[key] = feats
+        self._dirty[key] = feats
+        self._touched.discard(key)
+
+    def flush(self):
+        """Write back entries added since the last flush and bump the use time of entries read."""
+        if not self._dirty and not self._touched:
+            return
+        now = int(time.time())
+        rows = [(k[0], k[1], k[2], _phash_to_sql(f.phash), f.blur, f.expo, f.w, f.h, now) for k, f in self._dirty.items()]
+        touched = [(now, k[0], k[1], k[2]) for k in self._touched]
+        try:
+            con = self._connect()
+            try:
+                with con:
+                    # a file that changed keeps only its newest row
+                    con.executemany("DELETE FROM features WHERE path = ? AND NOT (mtime = ? AND size = ?)",
+                                    [(r[0], r[1], r[2]) for r in rows])
+                    con.executemany("INSERT OR REPLACE INTO features VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                    con.executemany("UPDATE features SET used = ? WHERE path = ? AND mtime = ? AND size = ?", touched)
+            finally:
+                con.close()
+            self._dirty.clear()
+            self._touched.clear()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to write feature cache {self.db_path}: {e}")
+
+    def clear(self):
+        """Forget every cached entry, in memory and on disk."""
+        self._rows.clear()
+        self._dirty.clear()
+        self._touched.clear()
+        self._queried.clear()
+        try:
+            con = self._connect()
+            try:
+                with con:
+                    con.execute("DELETE FROM features")
+            finally:
+                con.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to clear feature cache {self.db_path}: {e}")
@@ -0,0 +1,99 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
+import cv2
+
+from .dups import NO_PHASH, phash_thumbnail
+from .feature_cache import ImageFeatures
+from .filters import load_bgr, blur_score, exposure_score, image_size
+
+# Blur, exposure and the pHash thumbnail are computed on a copy downscaled to this long edge.
+ANALYSIS_LONG_EDGE = 512
+
+class QualityThresholds(NamedTuple):
+    min_w: int
+    min_h: int
+    min_blur: float
+    min_expo: float
+
+def quality_verdict(feats: ImageFeatures, q: QualityThresholds) -> Optional[bool]:
+    """
+    Check resolution, then exposure, then blur (cheapest first). Returns None when
+    a field needed to decide has not been computed yet.
+    """
+    if feats.w is None or feats.h is None:
+        return None
+    if feats.w < q.min_w or feats.h < q.min_h:
+        return False
+    if feats.expo is None:
+        return None
+    if feats.expo < q.min_expo:
+        return False
+    if feats.blur is None:
+        return None
+    return feats.blur >= q.min_blur
+
+def features_complete(feats: Optional[ImageFeatures], quality: Optional[QualityThresholds], need_phash: bool) -> bool:
+    """True if `feats` already holds everything the filters will look at."""
+    if feats is None:
+        return False
+    verdict = quality_verdict(feats, quality) if quality is not None else True
+    if verdict is None:
+        return False
+    return not need_phash or verdict is False or feats.phash is not None
+
+def downscale_for_analysis(img_bgr, long_edge: int = ANALYSIS_LONG_EDGE):
+    """Shrink an image (never enlarge) so its longer side is at most `long_edge` pixels."""
+    h, w = img_bgr.shape[:2]
+    scale = long_edge / max(h, w)
+    if scale >= 1.0:
+        return img_bgr
+    return cv2.resize(img_bgr, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+def compute_image_features(path: Path, quality: Optional[QualityThresholds], need_phash: bool,
+                           feats: Optional[ImageFeatures] = None, thumb_out=None) -> Tuple[ImageFeatures, bool]:
+    """
+    Fill in the fields of `feats` the filters still need, decoding the image at most once.
+    Resolution comes from the file header, so images that are too small are never decoded,
+    and images rejected by quality get no pHash. Everything else is measured on one
+    copy downscaled to ANALYSIS_LONG_EDGE.
+    When a pHash is still needed, the 32x32 thumbnail for phash_batch is written
+    into `thumb_out` and True is returned alongside the features; an undecodable
+    image gets NO_PHASH instead.
+    """
+    feats = feats if feats is not None else ImageFeatures()
+    if quality is not None and feats.w is None:
+        size = image_size(path)
+        if size is not None:
+            feats.w, feats.h = size
+    verdict = quality_verdict(feats, quality) if quality is not None else True
+    need_quality = verdict is None
+    need_phash = need_phash and verdict is not False and feats.phash is None
+    if not (need_quality or need_phash):
+        return feats, False
+
+    bgr = load_bgr(path)
+    if bgr is None or bgr.size == 0:
+        if need_quality:
+            feats.w, feats.h = 0, 0  # unreadable images always fail the quality filter
+        if need_phash:
+            feats.phash = NO_PHASH
+        return feats, False
+
+    if need_quality and feats.w is None:
+        feats.h, feats.w = bgr.shape[:2]  # real pixel count, before downscaling
+    small = downscale_for_analysis(bgr)
+    del bgr
+    if need_quality:
+        if feats.w >= quality.min_w and feats.h >= quality.min_h:
+            if feats.expo is None:
+                feats.expo = exposure_score(small)
+            if feats.expo >= quality.min_expo and feats.blur is None:
+                feats.blur = blur_score(small)
+        if not quality_verdict(feats, quality):
+            return feats, False
+    if need_phash:
+        if phash_thumbnail(small, out=thumb_out) is not None:
+            return feats, True
+        feats.phash = NO_PHASH
+    return feats, False
@@ -2,6 +2,8 @@ from __future__ import annotations
 import cv2
 import numpy as np
 from pathlib import Path
+from typing import Optional, Tuple
+from PIL import Image
 import logging
 
 logger = logging.getLogger(__name__)
@@ -46,3 +48,15 @@ def load_bgr(path: Path):
     except Exception as e:
         logger.warning(f"Failed to load image {path}: {e}")
         return None
+
+def image_size(path: Path) -> Optional[Tuple[int, int]]:
+    """(width, height) as load_bgr would decode it, read from the file header only."""
+    try:
+        with Image.open(path) as im:
+            w, h = im.size
+            if im.getexif().get(0x0112) in (5, 6, 7, 8):  # EXIF rotation by 90/270, applied by imdecode
+                w, h = h, w
+            return w, h
+    except Exception as e:
+        logger.warning(f"Failed to read image header {path}: {e}")
+        return None
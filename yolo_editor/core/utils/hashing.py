@@ -1,5 +1,14 @@
 from __future__ import annotations
 import hashlib
+from pathlib import Path
+from typing import Optional
+
+try:
+    import xxhash
+except ImportError:  # optional, only makes file_digest64 faster
+    xxhash = None
+
+_CHUNK = 1 << 20
 
 def stable_int_key(*parts: str, seed: int = 1337) -> int:
     h = hashlib.blake2s(digest_size=8)
@@ -7,3 +16,14 @@ def stable_int_key(*parts: str, seed: int = 1337) -> int:
         h.update(p.encode())
     h.update(str(seed).encode())
     return int.from_bytes(h.digest(), "big", signed=False)
+
+def file_digest64(path: Path) -> Optional[int]:
+    """64-bit content digest (xxh3 when available, blake2b otherwise); None if unreadable."""
+    h = xxhash.xxh3_64() if xxhash is not None else hashlib.blake2b(digest_size=8)
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(_CHUNK):
+                h.update(chunk)
+    except OSError:
+        return None
+    return int.from_bytes(h.digest(), "big", signed=False)
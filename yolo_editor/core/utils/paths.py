@@ -0,0 +1,9 @@
+from __future__ import annotations
+import os
+from pathlib import Path
+
+def default_config_dir() -> Path:
+    """Per-user directory for the app's config and caches."""
+    if os.name == 'nt':  # Windows
+        return Path.home() / "AppData" / "Local" / "YOLOEditor"
+    return Path.home() / ".config" / "yolo-editor"
@@ -10,6 +10,7 @@ import json
 import yaml
 from dataclasses import dataclass, asdict
 
+from ..core.utils.paths import default_config_dir
 from .interfaces import IConfigService, ILogger
 
 
@@ -82,12 +83,7 @@ class ConfigService(IConfigService):
     
     def _get_default_config_dir(self) -> Path:
         """Get the default configuration directory."""
-        import os
-        if os.name == 'nt':  # Windows
-            config_dir = Path.home() / "AppData" / "Local" / "YOLOEditor"
-        else:  # Unix-like
-            config_dir = Path.home() / ".config" / "yolo-editor"
-        return config_dir
+        return default_config_dir()
     
     def _ensure_config_dir(self) -> None:
         """Ensure the configuration directory exists."""
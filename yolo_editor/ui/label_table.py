@@ -33,9 +33,9 @@ class LabelTable(QWidget):
 
     def set_rows(self, rows: List[Row], class_names: List[str]):
         self.tbl.setRowCount(0)
-        for i, (c, x, y, w, h) in enumerate(rows):
-            r = self.tbl.rowCount(); self.tbl.insertRow(r)
-            self.tbl.setItem(r, 0, QTableWidgetItem(str(i+1)))
+        self.tbl.setRowCount(len(rows))
+        for r, (c, x, y, w, h) in enumerate(rows):
+            self.tbl.setItem(r, 0, QTableWidgetItem(str(r+1)))
             self.tbl.setItem(r, 1, QTableWidgetItem(f"{c} ({class_names[c] if 0<=c<len(class_names) else c})"))
             self.tbl.setItem(r, 2, QTableWidgetItem(f"{x:.6f}"))
             self.tbl.setItem(r, 3, QTableWidgetItem(f"{y:.6f}"))
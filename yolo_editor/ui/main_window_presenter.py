@@ -690,9 +690,8 @@ class MainWindowPresenter(QObject):
 
     def _fill_table(self, boxes: List[ViewBox]) -> None:
         self.labels_table.setRowCount(0)
-        for box in boxes:
-            row = self.labels_table.rowCount()
-            self.labels_table.insertRow(row)
+        self.labels_table.setRowCount(len(boxes))
+        for row, box in enumerate(boxes):
             name = self.names[box.cls] if 0 <= box.cls < len(self.names) else str(box.cls)
             self.labels_table.setItem(row, 0, QTableWidgetItem(name))
             self.labels_table.setItem(row, 1, QTableWidgetItem(str(box.cls)))
@@ -73,14 +73,15 @@ class MergeCanvas(QWidget):
         self.nodes[dataset_id] = node
 
         if classes:
-            for sc in classes:
-                sub = f"{sc.images} imgs, {sc.boxes} boxes"
-                node.add_class_block(
-                    text=f"{sc.class_name} ({sc.class_id})",
-                    subtext=sub,
-                    role="source",
-                    key=(dataset_id, sc.class_id),
-                )
+            with node.bulk_add():
+                for sc in classes:
+                    sub = f"{sc.images} imgs, {sc.boxes} boxes"
+                    node.add_class_block(
+                        text=f"{sc.class_name} ({sc.class_id})",
+                        subtext=sub,
+                        role="source",
+                        key=(dataset_id, sc.class_id),
+                    )
         elif loading:
             placeholder = node.add_class_block(
                 text="Loading classes...",
@@ -92,6 +93,7 @@ class MergeCanvas(QWidget):
             self.dataset_placeholders[dataset_id] = placeholder
 
         node.relayout()
+        self._tune_scene_index()
 
     def spawn_target_node(self, target_id: int, name: str, quota: Optional[int], pos: QPointF = QPointF(60, 60)):
         # force left column
@@ -102,6 +104,7 @@ class MergeCanvas(QWidget):
         self._add_target_block(node, target_id)
         node.enable_plus(lambda n=node: self._on_plus_new_target(n))
         node.relayout()
+        self._tune_scene_index()
 
     def update_dataset_stats(self, dataset_id: str, classes: list[SourceClass]):
         node = self.nodes.get(dataset_id)
@@ -137,16 +140,17 @@ class MergeCanvas(QWidget):
                 existing[int(blk.key[1])] = blk
 
         seen: set[int] = set()
-        for sc in classes:
-            text = f"{sc.class_name} ({sc.class_id})"
-            sub = f"{sc.images} imgs, {sc.boxes} boxes"
-            blk = existing.get(sc.class_id)
-            if blk:
-                blk.set_title(text)
-                blk.set_subtext(sub)
-            else:
-                node.add_class_block(text=text, subtext=sub, role="source", key=(dataset_id, sc.class_id))
-            seen.add(sc.class_id)
+        with node.bulk_add():
+            for sc in classes:
+                text = f"{sc.class_name} ({sc.class_id})"
+                sub = f"{sc.images} imgs, {sc.boxes} boxes"
+                blk = existing.get(sc.class_id)
+                if blk:
+                    blk.set_title(text)
+                    blk.set_subtext(sub)
+                else:
+                    node.add_class_block(text=text, subtext=sub, role="source", key=(dataset_id, sc.class_id))
+                seen.add(sc.class_id)
 
         for cid, blk in list(existing.items()):
             if cid not in seen and blk in node.blocks:
@@ -288,10 +292,11 @@ class MergeCanvas(QWidget):
             
             # Safely iterate through blocks
             if hasattr(node, 'blocks') and node.blocks:
-                for blk in node.blocks:
-                    if hasattr(blk, 'role') and hasattr(blk, 'key') and blk.role == "target" and blk.key == tid:
-                        blk.set_title(self._target_block_title(tid))
-                        blk.set_subtext(self._target_subtext(tid))
+                with node.bulk_add():
+                    for blk in node.blocks:
+                        if hasattr(blk, 'role') and hasattr(blk, 'key') and blk.role == "target" and blk.key == tid:
+                            blk.set_title(self._target_block_title(tid))
+                            blk.set_subtext(self._target_subtext(tid))
             
             # Safely call relayout
             if hasattr(node, 'relayout'):
@@ -371,6 +376,7 @@ class MergeCanvas(QWidget):
                     for tid in target_ids:
                         self._remove_target(tid)
         self._recalc_all_targets()
+        self._tune_scene_index()
 
     def _remove_target(self, target_id: int):
         node = self.target_nodes.pop(target_id, None)
@@ -405,6 +411,11 @@ class MergeCanvas(QWidget):
                     self.target_nodes.pop(tid, None)
         
         self._recalc_all_targets()
+        self._tune_scene_index()
+
+    def _tune_scene_index(self):
+        """Let the scene pick its index method for the current item count; call after adding or removing nodes."""
+        self.scene.tune_index(len(self.scene.items()))
 
     # ---------- CONTEXT ----------
     def _context_menu(self, pos):
@@ -539,7 +550,6 @@ class _GraphicsView(QGraphicsView):
 
         # port press?
         item = self.itemAt(e.pos())
-        from .node import Port
         if isinstance(item, Port):
             self.canvas.mousePressOnPort(item)
             e.accept(); return
@@ -563,7 +573,6 @@ class _GraphicsView(QGraphicsView):
             e.accept(); return
 
         item = self.itemAt(e.pos())
-        from .node import Port
         target = item if isinstance(item, Port) else None
         self.canvas.mouseReleaseOnPort(target)
         super().mouseReleaseEvent(e)
@@ -1,22 +1,28 @@
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+import threading
 from pathlib import Path
 from typing import Dict, Tuple, Optional
 
-from PySide6.QtCore import Qt, QObject, Signal, QThread
+import numpy as np
+from PySide6.QtCore import Qt, QObject, Signal, Slot, QThread
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QWidget, QListWidget, QListWidgetItem,
-    QFileDialog, QLabel, QGroupBox, QFormLayout, QSpinBox, QLineEdit, QTableWidget,
-    QTableWidgetItem, QComboBox, QSplitter, QMessageBox, QCheckBox, QProgressDialog, QTabWidget
+    QFileDialog, QLabel, QGroupBox, QFormLayout, QSpinBox, QLineEdit, QTableView,
+    QAbstractItemView, QSplitter, QMessageBox, QCheckBox, QProgressDialog, QTabWidget
 )
 
 from ...core.multi_repo import MultiRepo
 from ...core.merge_model import MergePlan, TargetClass, CopyMode, CollisionPolicy, SplitStrategy, BalanceMode
-from ...core.merge_selector import build_edge_index, select_with_quotas, SelectionResult
+from ...core.merge_selector import build_edge_index, select_with_quotas, flatten_selection, SelectionResult
 from ...core.merger import merge_execute
 from ...core.report import write_report
-from ...core.quality.dups import phash_hex, too_similar
-from ...core.quality.filters import load_bgr, blur_score, exposure_score, meets_min_resolution
+from ...core.utils.hashing import file_digest64
+from ...core.quality.dups import phash_batch
+from ...core.quality.feature_cache import FeatureCache, ImageFeatures, CacheKey
+from ...core.quality.features import QualityThresholds, compute_image_features, features_complete, quality_verdict
 from .preview_panel import PreviewPanel
+from .mapping_table import TargetsTableModel, MappingTableModel, SpinBoxDelegate, TargetComboDelegate
 from .canvas import MergeCanvas as MappingCanvas
 
 EdgeKey = Tuple[str, int]  # (dataset_id, class_id)
@@ -39,12 +45,152 @@ class MergeWorker(QObject):
                 sources=self.sources,
                 progress_cb=self._progress_cb,
                 cancel=None,
-                selection=self.selection
+                items=flatten_selection(self.sources, self.selection)
             )
             self.finished.emit(self.plan.output_dir)
         except Exception as e:
             self.failed.emit(str(e))
 
+class PreviewWorker(QObject):
+    progress = Signal(int, int)   # value, total
+    finished = Signal(object)     # per_target groups after filtering
+    failed = Signal(str)
+    canceled = Signal()
+    def __init__(self, plan: MergePlan, repo, features: FeatureCache, file_hash_cache: Dict[CacheKey, int],
+                 filter_params: dict):
+        super().__init__()
+        self.plan = plan
+        self.repo = repo
+        self._features = features
+        self._file_hash_cache = file_hash_cache
+        self.filter_params = filter_params
+        self.cancel_event = threading.Event()
+        self.result: Optional[Dict[int, list]] = None
+
+    def _run_pool(self, fn, items):
+        """Map `fn` over `items` in a thread pool, reporting progress; None if cancelled."""
+        items = list(items)
+        total = len(items)
+        out = []
+        with ThreadPoolExecutor() as pool:
+            for i, res in enumerate(pool.map(fn, items), 1):
+                if self.cancel_event.is_set():
+                    pool.shutdown(wait=True, cancel_futures=True)
+                    return None
+                out.append(res)
+                if i % 16 == 0 or i == total:
+                    self.progress.emit(i, total)
+        return out
+
+    def _collect_features(self, paths, quality: Optional[QualityThresholds], need_phash: bool) -> Optional[Dict[Path, ImageFeatures]]:
+        out: Dict[Path, ImageFeatures] = {}
+        todo = []
+        paths = list(paths)
+        self._features.load(str(p) for p in paths)
+        for p in paths:
+            key = FeatureCache.key_for(p)
+            feats = self._features.get(key) if key else None
+            if features_complete(feats, quality, need_phash):
+                out[p] = feats
+            else:
+                todo.append((p, key, feats))
+        if todo:
+            # cv2 releases the GIL while decoding, so threads overlap the JPEG work;
+            # each one writes its pHash thumbnail straight into its own slot of the batch
+            thumbs = np.zeros((len(todo), 32, 32), dtype=np.float32) if need_phash else None
+            def work(i):
+                p, _, feats = todo[i]
+                return compute_image_features(p, quality, need_phash, feats,
+                                              thumb_out=thumbs[i] if thumbs is not None else None)
+            results = self._run_pool(work, range(len(todo)))
+            if results is None:
+                return None
+            if thumbs is not None:
+                # only rows whose image decoded hold a thumbnail worth hashing
+                hashed = [i for i, (_, has_thumb) in enumerate(results) if has_thumb]
+                if hashed:
+                    for i, h in zip(hashed, phash_batch(thumbs[hashed])):
+                        results[i][0].phash = h
+            for (p, key, _), (feats, _) in zip(todo, results):
+                out[p] = feats
+                if key: self._features.put(key, feats)
+            self._features.flush()
+        return out
+
+    def _file_digests(self, paths) -> Optional[Dict[Path, int]]:
+        out: Dict[Path, int] = {}
+        todo = []
+        for p in paths:
+            key = FeatureCache.key_for(p)
+            d = self._file_hash_cache.get(key) if key else None
+            if d is None: todo.append((p, key))
+            else: out[p] = d
+        if todo:
+            results = self._run_pool(lambda t: file_digest64(t[0]), todo)
+            if results is None:
+                return None
+            for (p, key), d in zip(todo, results):
+                if d is None: continue
+                out[p] = d
+                if key: self._file_hash_cache[key] = d
+        return out
+
+    def _apply_filters(self, per_target: dict[int, list], dedup_on: bool, dedup_thr: int,
+                       qual_on: bool, min_w: int, min_h: int, min_blur: int, min_expo: int) -> bool:
+        """Filter `per_target` in place; returns False if cancelled."""
+        if not (dedup_on or qual_on):
+            return True
+        paths = {img_path for groups in per_target.values() for g in groups for (_, img_path) in g.images}
+
+        # Byte-identical files share their features, so only one copy per digest is decoded.
+        digests = self._file_digests(paths) if dedup_on else {}
+        if digests is None:
+            return False
+        reps: Dict[int, Path] = {}
+        for p, d in digests.items():
+            reps.setdefault(d, p)
+        unique = [p for p in paths if p not in digests or reps[digests[p]] == p]
+        quality = QualityThresholds(min_w, min_h, min_blur, min_expo) if qual_on else None
+        features = self._collect_features(unique, quality, dedup_on)
+        if features is None:
+            return False
+        for p in paths:
+            if p not in features:
+                features[p] = features[reps[digests[p]]]
+
+        for tgt, groups in per_target.items():
+            seen_digests: set[int] = set()
+            seen_hashes: list[int] = []
+            for g in groups:
+                kept = []
+                for (dsid, img_path) in g.images:
+                    feats = features[img_path]
+                    if quality is not None and not quality_verdict(feats, quality):
+                        continue
+                    if dedup_on:
+                        d = digests.get(img_path)
+                        if d is not None:
+                            if d in seen_digests: continue
+                            seen_digests.add(d)
+                        h = feats.phash
+                        if h is not None and h >= 0:
+                            if any((h ^ hs).bit_count() <= dedup_thr for hs in seen_hashes): continue
+                            seen_hashes.append(h)
+                    kept.append((dsid, img_path))
+                g.images = kept
+        return True
+
+    def run(self):
+        try:
+            per_target = build_edge_index(self.plan, self.repo)
+            if self.cancel_event.is_set() or not self._apply_filters(per_target, **self.filter_params):
+                self.canceled.emit()
+                return
+            self.result = per_target
+            self.finished.emit(per_target)
+        except Exception as e:
+            self.failed.emit(str(e))
+
 class MergeDesignerDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -56,13 +202,21 @@ class MergeDesignerDialog(QDialog):
         self.btn_add_root = QPushButton("Add Dataset Root...")
         self.btn_add_yaml = QPushButton("Add Dataset YAML...")
 
-        self.tbl_targets = QTableWidget(0, 3)
-        self.tbl_targets.setHorizontalHeaderLabels(["Index", "Name", "Quota (images)"])
+        self.targets_model = TargetsTableModel(self)
+        self.tbl_targets = QTableView()
+        self.tbl_targets.setModel(self.targets_model)
+        self.tbl_targets.setItemDelegateForColumn(2, SpinBoxDelegate(0, 10_000_000, self.tbl_targets))
+        self.tbl_targets.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.btn_add_target = QPushButton("Add Target Class")
         self.btn_del_target = QPushButton("Delete Selected Target")
 
-        self.tbl_mapping = QTableWidget(0, 5)
-        self.tbl_mapping.setHorizontalHeaderLabels(["Dataset", "Source ID", "Source Name", "Limit", "Target"])
+        # editors are created only while a cell is being edited, not one widget pair per row
+        self.mapping_model = MappingTableModel(self.targets_model, self)
+        self.tbl_mapping = QTableView()
+        self.tbl_mapping.setModel(self.mapping_model)
+        self.tbl_mapping.setItemDelegateForColumn(MappingTableModel.COL_LIMIT, SpinBoxDelegate(0, 10_000_000, self.tbl_mapping))
+        self.tbl_mapping.setItemDelegateForColumn(MappingTableModel.COL_TARGET, TargetComboDelegate(self.targets_model, self.tbl_mapping))
+        self.tbl_mapping.setEditTriggers(QAbstractItemView.AllEditTriggers)
         self.tbl_mapping.verticalHeader().setVisible(False)
         self.tbl_mapping.setSortingEnabled(False)
 
@@ -77,6 +231,8 @@ class MergeDesignerDialog(QDialog):
         self.spn_minw.setValue(320); self.spn_minh.setValue(240)
         self.spn_blur.setValue(50); self.spn_expo.setValue(0)
 
+        self.btn_reindex = QPushButton("Reindex")
+        self.btn_reindex.setToolTip("Discard cached pHash/quality results and rescan images on next preview")
         self.btn_preview = QPushButton("Preview")
         self.btn_merge = QPushButton("Merge...")
 
@@ -117,7 +273,7 @@ class MergeDesignerDialog(QDialog):
         flo.addRow(qrow)
         left_l.addWidget(grp_opt)
 
-        btnrow = QHBoxLayout(); btnrow.addStretch(1); btnrow.addWidget(self.btn_preview); btnrow.addWidget(self.btn_merge)
+        btnrow = QHBoxLayout(); btnrow.addWidget(self.btn_reindex); btnrow.addStretch(1); btnrow.addWidget(self.btn_preview); btnrow.addWidget(self.btn_merge)
         left_l.addLayout(btnrow)
 
         split = QSplitter()
@@ -130,12 +286,17 @@ class MergeDesignerDialog(QDialog):
 
         self._ds_count = 0
         self._last_preview: Optional[SelectionResult] = None
+        self._preview_progress: Optional[QProgressDialog] = None  # open while a PreviewWorker runs
+        self._features = FeatureCache()
+        self._file_hash_cache: Dict[CacheKey, int] = {}
 
         self.btn_add_root.clicked.connect(self._on_add_root)
         self.btn_add_yaml.clicked.connect(self._on_add_yaml)
         self.btn_add_target.clicked.connect(self._on_add_target)
         self.btn_del_target.clicked.connect(self._on_del_target)
+        self.targets_model.dataChanged.connect(self._on_targets_changed)
         self.btn_output.clicked.connect(self._on_pick_output)
+        self.btn_reindex.clicked.connect(self._on_reindex)
         self.btn_preview.clicked.connect(self._on_preview)
         self.btn_merge.clicked.connect(self._on_merge)
 
@@ -158,76 +319,37 @@ class MergeDesignerDialog(QDialog):
         self.repo.add(ds_id, root=root, yaml_path=yaml_path, display_name=root.name)
         item = QListWidgetItem(f"{ds_id}: {root}")
         self.datasets_list.addItem(item)
-        self._rebuild_mapping_table()
+        self._append_dataset_rows(self.repo.items[ds_id])
         self._refresh_canvas()
 
     # Tables
 
     def _target_names_dict(self) -> Dict[int, str]:
-        names = {}
-        for r in range(self.tbl_targets.rowCount()):
-            idx = int(self.tbl_targets.item(r, 0).text())
-            nm = self.tbl_targets.item(r, 1).text()
-            names[idx] = nm
-        return names
-
-    def _rebuild_mapping_table(self):
-        rows = []
-        for ds in self.repo:
-            repo = ds.repo
-            names = getattr(repo, "names", None) or [f"id_{i}" for i in range(getattr(repo, "nc", 0) or 0)]
-            for cid, cname in enumerate(names):
-                rows.append((ds.id, cid, str(cname)))
-        rows.sort(key=lambda t: (t[0], t[1]))
-
-        self.tbl_mapping.setRowCount(0)
-        for (dsid, cid, cname) in rows:
-            r = self.tbl_mapping.rowCount()
-            self.tbl_mapping.insertRow(r)
-            self.tbl_mapping.setItem(r, 0, QTableWidgetItem(dsid))
-            self.tbl_mapping.setItem(r, 1, QTableWidgetItem(str(cid)))
-            self.tbl_mapping.setItem(r, 2, QTableWidgetItem(cname))
-            spn = QSpinBox(); spn.setRange(0, 10_000_000); spn.setValue(10_000_000)
-            self.tbl_mapping.setCellWidget(r, 3, spn)
-            cmb = QComboBox(); self._refresh_target_combo(cmb)
-            self.tbl_mapping.setCellWidget(r, 4, cmb)
-
-    def _refresh_target_combo(self, combo: QComboBox):
-        combo.clear()
-        targets = []
-        for r in range(self.tbl_targets.rowCount()):
-            idx = self.tbl_targets.item(r, 0)
-            name = self.tbl_targets.item(r, 1)
-            if idx and name:
-                targets.append((int(idx.text()), name.text()))
-        targets.sort(key=lambda t: t[0])
-        for idx, name in targets:
-            combo.addItem(f"{idx}: {name}", idx)
+        return self.targets_model.names()
+
+    def _append_dataset_rows(self, ds):
+        # rows stay grouped by dataset in the order datasets were added
+        repo = ds.repo
+        names = getattr(repo, "names", None) or [f"id_{i}" for i in range(getattr(repo, "nc", 0) or 0)]
+        rows = [(ds.id, cid, cname if isinstance(cname, str) else str(cname)) for cid, cname in enumerate(names)]
+        self.mapping_model.append_rows(rows)
 
     def _on_add_target(self):
-        r = self.tbl_targets.rowCount()
-        self.tbl_targets.insertRow(r)
-        self.tbl_targets.setItem(r, 0, QTableWidgetItem(str(r)))
-        self.tbl_targets.setItem(r, 1, QTableWidgetItem(f"class_{r}"))
-        spn = QSpinBox(); spn.setRange(0, 10_000_000); spn.setValue(0)
-        self.tbl_targets.setCellWidget(r, 2, spn)
-        for rr in range(self.tbl_mapping.rowCount()):
-            cmb: QComboBox = self.tbl_mapping.cellWidget(rr, 4)
-            self._refresh_target_combo(cmb)
+        self.targets_model.add_target()
+        self.mapping_model.refresh_targets()
         self._refresh_canvas()
 
     def _on_del_target(self):
-        rows = sorted({i.row() for i in self.tbl_targets.selectedIndexes()}, reverse=True)
+        rows = {i.row() for i in self.tbl_targets.selectionModel().selectedIndexes()}
         if not rows: return
-        for r in rows:
-            self.tbl_targets.removeRow(r)
-        for r in range(self.tbl_targets.rowCount()):
-            self.tbl_targets.item(r, 0).setText(str(r))
-        for rr in range(self.tbl_mapping.rowCount()):
-            cmb: QComboBox = self.tbl_mapping.cellWidget(rr, 4)
-            self._refresh_target_combo(cmb)
+        remap = self.targets_model.remove_targets(rows)
+        self.mapping_model.refresh_targets(remap)
         self._refresh_canvas()
 
+    @Slot()
+    def _on_targets_changed(self):
+        self.mapping_model.refresh_targets()
+
     # Build plan
 
     def _build_plan(self) -> Optional[MergePlan]:
@@ -238,11 +360,9 @@ class MergeDesignerDialog(QDialog):
 
         tclasses = []
         quotas = {}
-        for r in range(self.tbl_targets.rowCount()):
-            idx = int(self.tbl_targets.item(r, 0).text())
-            name = self.tbl_targets.item(r, 1).text().strip() or f"class_{idx}"
-            spn: QSpinBox = self.tbl_targets.cellWidget(r, 2)
-            q = int(spn.value())
+        for idx, t in enumerate(self.targets_model.targets):
+            name = t["name"].strip() or f"class_{idx}"
+            q = int(t["quota"])
             tclasses.append(TargetClass(index=idx, name=name))
             if q > 0:
                 quotas[idx] = q
@@ -250,15 +370,10 @@ class MergeDesignerDialog(QDialog):
 
         mapping: Dict[EdgeKey, Optional[int]] = {}
         edge_limit: Dict[EdgeKey, int] = {}
-        for r in range(self.tbl_mapping.rowCount()):
-            dsid = self.tbl_mapping.item(r, 0).text()
-            cid = int(self.tbl_mapping.item(r, 1).text())
-            cmb: QComboBox = self.tbl_mapping.cellWidget(r, 4)
-            tgt_idx = cmb.currentData()
-            if tgt_idx is not None:
-                mapping[(dsid, cid)] = int(tgt_idx)
-            spn: QSpinBox = self.tbl_mapping.cellWidget(r, 3)
-            edge_limit[(dsid, cid)] = int(spn.value())
+        for key, st in self.mapping_model.state.items():
+            if st["target"] is not None:
+                mapping[key] = st["target"]
+            edge_limit[key] = st["limit"]
 
         plan = MergePlan(
             name="merged",
@@ -281,35 +396,9 @@ class MergeDesignerDialog(QDialog):
 
     # Filters & Preview
 
-    def _apply_filters(self, per_target: dict[int, list], dedup_on: bool, dedup_thr: int,
-                       qual_on: bool, min_w: int, min_h: int, min_blur: int, min_expo: int):
-        phash_cache: Dict[Path, str] = {}
-        qual_cache: Dict[Path, bool] = {}
-
-        for tgt, groups in per_target.items():
-            seen_hashes: list[str] = []
-            for g in groups:
-                kept = []
-                for (dsid, img_path) in g.images:
-                    if qual_on:
-                        ok = qual_cache.get(img_path)
-                        if ok is None:
-                            bgr = load_bgr(img_path)
-                            ok = meets_min_resolution(bgr, min_w, min_h) and (blur_score(bgr) >= min_blur) and (exposure_score(bgr) >= min_expo)
-                            qual_cache[img_path] = ok
-                        if not ok: continue
-                    if dedup_on:
-                        h = phash_cache.get(img_path)
-                        if h is None:
-                            try: h = phash_hex(img_path)
-                            except Exception: h = ""
-                            phash_cache[img_path] = h
-                        if h:
-                            dup = any(too_similar(hs, h, max_dist=dedup_thr) for hs in seen_hashes)
-                            if dup: continue
-                            seen_hashes.append(h)
-                    kept.append((dsid, img_path))
-                g.images = kept
+    def _on_reindex(self):
+        self._features.clear()
+        self._file_hash_cache.clear()
 
     def _on_preview(self):
         if len(self.repo) == 0:
@@ -318,14 +407,43 @@ class MergeDesignerDialog(QDialog):
         plan = self._build_plan()
         if not plan: return
 
-        per_target = build_edge_index(plan, self.repo)
-        self._apply_filters(
-            per_target,
+        worker = PreviewWorker(plan, self.repo, self._features, self._file_hash_cache, dict(
             dedup_on=self.chk_dedup.isChecked(), dedup_thr=self.spn_dedup.value(),
             qual_on=self.chk_quality.isChecked(),
             min_w=self.spn_minw.value(), min_h=self.spn_minh.value(),
             min_blur=self.spn_blur.value(), min_expo=self.spn_expo.value()
-        )
+        ))
+        thread = QThread(self)
+        worker.moveToThread(thread)
+
+        progress = QProgressDialog("Scanning images...", "Cancel", 0, 0, self)
+        progress.setWindowModality(Qt.WindowModal)
+        # the worker runs several passes; only the finished/failed/canceled slots close the dialog
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+        self._preview_progress = progress
+
+        # bound slots of this dialog, so the worker's signals are queued onto the GUI thread
+        worker.progress.connect(self._on_preview_progress)
+        worker.finished.connect(self._close_preview_progress)
+        worker.canceled.connect(self._close_preview_progress)
+        worker.failed.connect(self._on_preview_failed)
+        thread.started.connect(worker.run)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        progress.canceled.connect(worker.cancel_event.set)
+
+        thread.start()
+        progress.exec()
+        if progress.wasCanceled():
+            worker.cancel_event.set()
+        thread.quit(); thread.wait()
+        self._preview_progress = None
+
+        per_target = worker.result
+        if per_target is None:
+            self._last_preview = None  # don't let a cancelled preview merge a stale selection
+            return
 
         sel = select_with_quotas(plan, per_target)
         self._last_preview = sel
@@ -336,35 +454,40 @@ class MergeDesignerDialog(QDialog):
 
         self._refresh_canvas()
 
+    @Slot(int, int)
+    def _on_preview_progress(self, val: int, tot: int):
+        progress = self._preview_progress
+        if progress is None:
+            return
+        progress.setMaximum(tot if tot > 0 else 100)
+        progress.setValue(val)
+
+    @Slot()
+    def _close_preview_progress(self):
+        """Ends progress.exec() in _on_preview once the worker has finished or been cancelled."""
+        if self._preview_progress is not None:
+            self._preview_progress.close()
+
+    @Slot(str)
+    def _on_preview_failed(self, msg: str):
+        self._close_preview_progress()
+        QMessageBox.critical(self, "Preview failed", msg)
+
     def _refresh_canvas(self):
         srcs = []
         current_dsid = None
         buf = None
-        for i in range(self.tbl_mapping.rowCount()):
-            dsid = self.tbl_mapping.item(i, 0).text()
-            cid = int(self.tbl_mapping.item(i, 1).text())
-            cname = self.tbl_mapping.item(i, 2).text()
+        for (dsid, cid), st in self.mapping_model.state.items():
             if dsid != current_dsid:
                 if buf: srcs.append((current_dsid, buf))
                 current_dsid = dsid
                 buf = []
-            buf.append((cid, cname))
+            buf.append((cid, st["name"]))
         if buf: srcs.append((current_dsid, buf))
 
-        tgts = []
-        for r in range(self.tbl_targets.rowCount()):
-            idx = int(self.tbl_targets.item(r, 0).text())
-            name = self.tbl_targets.item(r, 1).text()
-            tgts.append((idx, name))
-
-        edges = []
-        for i in range(self.tbl_mapping.rowCount()):
-            dsid = self.tbl_mapping.item(i, 0).text()
-            cid = int(self.tbl_mapping.item(i, 1).text())
-            cmb: QComboBox = self.tbl_mapping.cellWidget(i, 4)
-            tgt_idx = cmb.currentData()
-            if tgt_idx is not None:
-                edges.append(((dsid, cid), int(tgt_idx)))
+        tgts = list(self.targets_model.names().items())
+
+        edges = [(key, st["target"]) for key, st in self.mapping_model.state.items() if st["target"] is not None]
 
         self.canvas.set_data(srcs, tgts, edges)
 
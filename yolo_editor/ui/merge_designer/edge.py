@@ -19,6 +19,9 @@ class EdgeItem(QGraphicsPathItem):
         self.floating_pos: QPointF | None = None
         self.edge_key: Optional[Tuple[str, int]] = None  # (dataset_id, class_id)
         self.target_id: Optional[int] = None
+        self._last_p1: QPointF | None = None
+        self._last_p2: QPointF | None = None
+        self._path = QPainterPath()  # reused on every rebuild
         self._update_path()
 
     def assign_metadata(self, edge_key: Tuple[str, int], target_id: int):
@@ -44,10 +47,18 @@ class EdgeItem(QGraphicsPathItem):
         p2 = self._anchor(self.dst_item)
         if p1 is None or p2 is None:
             return
+        if self._last_p1 is not None and self._last_p2 is not None \
+                and (p1 - self._last_p1).manhattanLength() < 0.01 \
+                and (p2 - self._last_p2).manhattanLength() < 0.01:
+            return
+        self._last_p1 = QPointF(p1)
+        self._last_p2 = QPointF(p2)
         dx = abs(p2.x() - p1.x())
         c1 = QPointF(p1.x() + dx * 0.5, p1.y())
         c2 = QPointF(p2.x() - dx * 0.5, p2.y())
-        path = QPainterPath(p1)
+        path = self._path
+        path.clear()
+        path.moveTo(p1)
         path.cubicTo(c1, c2, p2)
         self.setPath(path)
 
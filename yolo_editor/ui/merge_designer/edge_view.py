@@ -1,7 +1,58 @@
 from __future__ import annotations
+from collections import Counter
 from typing import List, Dict, Tuple, Any
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QHeaderView, QPushButton, QHBoxLayout
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTableView, QHeaderView, QPushButton, QHBoxLayout
+from PySide6.QtCore import Qt, Signal, Slot, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QColor
+
+class EdgeTableModel(QAbstractTableModel):
+    """Edge dicts shown by EdgeView; rows are inserted and removed one at a time."""
+    HEADERS = ["Source Dataset", "Source Class", "Target Class", "Status"]
+
+    def __init__(self, edges: List[Dict[str, Any]], parent=None):
+        super().__init__(parent)
+        self.edges = edges
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.edges)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        edge = self.edges[index.row()]
+        col = index.column()
+        if role == Qt.DisplayRole:
+            if col == 0: return edge['source_dataset']
+            if col == 1: return f"{edge['source_class_name']} ({edge['source_class_id']})"
+            if col == 2: return f"{edge['target_name']} ({edge['target_id']})"
+            if col == 3: return edge['status']
+        elif role == Qt.ForegroundRole and col == 3:
+            return QColor(Qt.green) if edge['status'] == 'active' else QColor(Qt.red)
+        return None
+
+    def append_edge(self, edge: Dict[str, Any]):
+        row = len(self.edges)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.edges.append(edge)
+        self.endInsertRows()
+
+    def remove_edge_at(self, row: int):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.edges[row]
+        self.endRemoveRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.edges.clear()
+        self.endResetModel()
 
 class EdgeView(QWidget):
     """Widget for displaying and managing edges/connections in merge designer."""
@@ -12,8 +63,11 @@ class EdgeView(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setup_ui()
         self.edges: List[Dict[str, Any]] = []
+        self._edge_keys: set = set()          # (dataset_id, class_id, target_id)
+        self._target_counts: Counter = Counter()  # target_id -> edges into it
+        self._source_counts: Counter = Counter()  # (dataset_id, class_id) -> edges out of it
+        self.setup_ui()
     
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -31,10 +85,11 @@ class EdgeView(QWidget):
         layout.addLayout(header_layout)
         
         # Edges table
-        self.edges_table = QTableWidget(0, 4)
-        self.edges_table.setHorizontalHeaderLabels(["Source Dataset", "Source Class", "Target Class", "Status"])
+        self.model = EdgeTableModel(self.edges, self)
+        self.edges_table = QTableView()
+        self.edges_table.setModel(self.model)
         self.edges_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.edges_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.edges_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.edges_table.selectionModel().selectionChanged.connect(self._on_selection_changed)
         layout.addWidget(self.edges_table)
         
@@ -45,6 +100,10 @@ class EdgeView(QWidget):
     def add_edge(self, source_dataset: str, source_class_id: int, source_class_name: str, 
                  target_id: int, target_name: str):
         """Add a new edge/connection."""
+        key = (source_dataset, source_class_id, target_id)
+        if key in self._edge_keys:
+            return False  # Edge already exists
+
         edge = {
             'source_dataset': source_dataset,
             'source_class_id': source_class_id,
@@ -54,26 +113,28 @@ class EdgeView(QWidget):
             'status': 'active'
         }
         
-        # Check if edge already exists
-        for existing in self.edges:
-            if (existing['source_dataset'] == source_dataset and 
-                existing['source_class_id'] == source_class_id and
-                existing['target_id'] == target_id):
-                return False  # Edge already exists
-        
-        self.edges.append(edge)
-        self._update_display()
+        self._edge_keys.add(key)
+        self._target_counts[target_id] += 1
+        self._source_counts[(source_dataset, source_class_id)] += 1
+        self.model.append_edge(edge)
+        self._update_stats()
         self.edge_selected.emit((source_dataset, source_class_id), target_id)
         return True
     
     def remove_edge(self, source_dataset: str, source_class_id: int, target_id: int):
         """Remove an edge/connection."""
+        key = (source_dataset, source_class_id, target_id)
+        if key not in self._edge_keys:
+            return False
         for i, edge in enumerate(self.edges):
             if (edge['source_dataset'] == source_dataset and 
                 edge['source_class_id'] == source_class_id and
                 edge['target_id'] == target_id):
-                del self.edges[i]
-                self._update_display()
+                self.model.remove_edge_at(i)
+                self._edge_keys.discard(key)
+                self._uncount(self._target_counts, target_id)
+                self._uncount(self._source_counts, (source_dataset, source_class_id))
+                self._update_stats()
                 self.edge_removed.emit((source_dataset, source_class_id), target_id)
                 return True
         return False
@@ -88,43 +149,35 @@ class EdgeView(QWidget):
     
     def clear(self):
         """Clear all edges."""
-        self.edges.clear()
-        self._update_display()
+        self.model.clear()
+        self._edge_keys.clear()
+        self._target_counts.clear()
+        self._source_counts.clear()
+        self._update_stats()
     
-    def _update_display(self):
-        """Update the display with current edge information."""
-        self.edges_table.setRowCount(len(self.edges))
-        
-        for row, edge in enumerate(self.edges):
-            self.edges_table.setItem(row, 0, QTableWidgetItem(edge['source_dataset']))
-            self.edges_table.setItem(row, 1, QTableWidgetItem(f"{edge['source_class_name']} ({edge['source_class_id']})"))
-            self.edges_table.setItem(row, 2, QTableWidgetItem(f"{edge['target_name']} ({edge['target_id']})"))
-            
-            status_item = QTableWidgetItem(edge['status'])
-            if edge['status'] == 'active':
-                status_item.setForeground(Qt.green)
-            else:
-                status_item.setForeground(Qt.red)
-            self.edges_table.setItem(row, 3, status_item)
+    @staticmethod
+    def _uncount(counter: Counter, key):
+        counter[key] -= 1
+        if counter[key] <= 0:
+            del counter[key]
         
-        # Update stats
+    def _update_stats(self):
+        """Update the stats line from the running source/target counters."""
         if self.edges:
-            unique_targets = len(set(edge['target_id'] for edge in self.edges))
-            unique_sources = len(set((edge['source_dataset'], edge['source_class_id']) for edge in self.edges))
-            self.stats_label.setText(f"{len(self.edges)} connections, {unique_sources} sources → {unique_targets} targets")
+            self.stats_label.setText(f"{len(self.edges)} connections, {len(self._source_counts)} sources → {len(self._target_counts)} targets")
         else:
             self.stats_label.setText("No connections")
     
+    @Slot()
     def _on_selection_changed(self):
         """Handle selection change in edges table."""
-        has_selection = len(self.edges_table.selectedItems()) > 0
+        has_selection = self.edges_table.selectionModel().hasSelection()
         self.remove_button.setEnabled(has_selection)
     
+    @Slot()
     def _on_remove_selected(self):
         """Handle remove selected button click."""
-        selected_rows = set()
-        for item in self.edges_table.selectedItems():
-            selected_rows.add(item.row())
+        selected_rows = {index.row() for index in self.edges_table.selectionModel().selectedRows()}
         
         # Remove edges in reverse order to maintain indices
         for row in sorted(selected_rows, reverse=True):
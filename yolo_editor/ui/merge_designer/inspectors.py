@@ -1,7 +1,8 @@
 from __future__ import annotations
-from typing import Dict, Any, Optional
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QFormLayout, QLineEdit, QSpinBox, QComboBox, QGroupBox
-from PySide6.QtCore import Qt, Signal
+from functools import partial
+from typing import Dict, Any, Optional, Tuple
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QFormLayout, QLineEdit, QSpinBox, QDoubleSpinBox, QComboBox, QGroupBox
+from PySide6.QtCore import Qt, Signal, QSignalBlocker
 
 class PropertyInspector(QWidget):
     """Widget for inspecting and editing properties of selected items."""
@@ -11,6 +12,10 @@ class PropertyInspector(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._form_host: Optional[QWidget] = None
+        self._widget_cache: Dict[str, QWidget] = {}  # property name -> editor in the current form
+        self._form_shape: Optional[Tuple[Tuple[str, str], ...]] = None  # (name, kind) per row
+        self._loading = False  # set while editors are being filled from an item
         self.setup_ui()
         self.current_item: Optional[Dict[str, Any]] = None
     
@@ -24,7 +29,9 @@ class PropertyInspector(QWidget):
         
         # Properties form
         self.properties_group = QGroupBox("Item Properties")
-        self.properties_layout = QFormLayout(self.properties_group)
+        self._group_layout = QVBoxLayout(self.properties_group)
+        self._group_layout.setContentsMargins(0, 0, 0, 0)
+        self._new_form_host()
         layout.addWidget(self.properties_group)
         
         # Initially hidden
@@ -33,8 +40,17 @@ class PropertyInspector(QWidget):
     def inspect_item(self, item: Dict[str, Any]):
         """Inspect a new item and update the form."""
         self.current_item = item
-        self._clear_form()
-        self._populate_form(item)
+        shape = tuple((name, self._kind(value)) for name, value in item.items())
+        self._loading = True
+        try:
+            if shape == self._form_shape:
+                self._update_form(item)
+            else:
+                self._clear_form()
+                self._populate_form(item)
+                self._form_shape = shape
+        finally:
+            self._loading = False
         self.properties_group.setVisible(True)
     
     def clear_inspection(self):
@@ -43,49 +59,99 @@ class PropertyInspector(QWidget):
         self._clear_form()
         self.properties_group.setVisible(False)
     
+    def _new_form_host(self):
+        self._form_host = QWidget()
+        self.properties_layout = QFormLayout(self._form_host)
+        self._group_layout.addWidget(self._form_host)
+    
     def _clear_form(self):
-        """Clear all form widgets."""
-        while self.properties_layout.count():
-            child = self.properties_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+        """Drop all form widgets at once by replacing their parent."""
+        if self._form_host is not None and self._widget_cache:
+            self._form_host.setParent(None)
+            self._form_host.deleteLater()
+            self._new_form_host()
+        self._widget_cache.clear()
+        self._form_shape = None
+    
+    @staticmethod
+    def _kind(value: Any) -> str:
+        """Editor kind for a value, in the same order _populate_form checks types."""
+        if isinstance(value, str): return "str"
+        if isinstance(value, int): return "int"
+        if isinstance(value, float): return "float"
+        if isinstance(value, bool): return "bool"
+        return "other"
     
     def _populate_form(self, item: Dict[str, Any]):
         """Populate the form with item properties."""
         for prop_name, prop_value in item.items():
             if isinstance(prop_value, str):
                 widget = QLineEdit(str(prop_value))
-                widget.textChanged.connect(lambda text, name=prop_name: self._on_property_changed(name, text))
+                widget.textChanged.connect(partial(self._on_str_changed, prop_name))
             elif isinstance(prop_value, int):
                 widget = QSpinBox()
                 widget.setRange(-999999, 999999)
                 widget.setValue(prop_value)
-                widget.valueChanged.connect(lambda value, name=prop_name: self._on_property_changed(name, value))
+                widget.valueChanged.connect(partial(self._on_int_changed, prop_name))
             elif isinstance(prop_value, float):
-                widget = QLineEdit(str(prop_value))
-                widget.textChanged.connect(lambda text, name=prop_name: self._on_property_changed(name, text))
+                widget = QDoubleSpinBox()
+                widget.setDecimals(6)
+                widget.setRange(-1e9, 1e9)
+                widget.setKeyboardTracking(False)  # emit committed values, not every keystroke
+                widget.setValue(prop_value)
+                widget.valueChanged.connect(partial(self._on_float_changed, prop_name))
             elif isinstance(prop_value, bool):
                 widget = QComboBox()
                 widget.addItems(["False", "True"])
                 widget.setCurrentText(str(prop_value))
-                widget.currentTextChanged.connect(lambda text, name=prop_name: self._on_property_changed(name, text == "True"))
+                widget.currentTextChanged.connect(partial(self._on_bool_changed, prop_name))
             else:
                 widget = QLineEdit(str(prop_value))
                 widget.setReadOnly(True)
             
+            self._widget_cache[prop_name] = widget
             self.properties_layout.addRow(prop_name, widget)
     
+    def _update_form(self, item: Dict[str, Any]):
+        """Load an item with the same properties as the last one into the existing editors."""
+        for prop_name, prop_value in item.items():
+            widget = self._widget_cache[prop_name]
+            with QSignalBlocker(widget):
+                if isinstance(widget, (QSpinBox, QDoubleSpinBox)):
+                    widget.setValue(prop_value)
+                elif isinstance(widget, QComboBox):
+                    widget.setCurrentText(str(prop_value))
+                else:
+                    widget.setText(str(prop_value))
+    
+    def _on_str_changed(self, property_name: str, text: str):
+        self._on_property_changed(property_name, text)
+    
+    def _on_int_changed(self, property_name: str, value: int):
+        self._on_property_changed(property_name, value)
+    
+    def _on_float_changed(self, property_name: str, value: float):
+        self._on_property_changed(property_name, value)
+    
+    def _on_bool_changed(self, property_name: str, text: str):
+        self._on_property_changed(property_name, text == "True")
+    
     def _on_property_changed(self, property_name: str, new_value: Any):
-        """Handle property change."""
-        if self.current_item is not None:
-            self.current_item[property_name] = new_value
-            self.property_changed.emit(property_name, new_value)
+        """Handle property change; values the item already holds are not re-emitted."""
+        if self._loading or self.current_item is None:
+            return
+        if property_name in self.current_item and self.current_item[property_name] == new_value:
+            return
+        self.current_item[property_name] = new_value
+        self.property_changed.emit(property_name, new_value)
 
 class DatasetInspector(QWidget):
     """Specialized inspector for dataset properties."""
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        # dataset info not yet shown ({} = cleared); flushed when the inspector becomes visible
+        self._pending: Optional[Dict[str, Any]] = None
         self.setup_ui()
     
     def setup_ui(self):
@@ -113,15 +179,33 @@ class DatasetInspector(QWidget):
         layout.addStretch(1)
     
     def inspect_dataset(self, dataset_info: Dict[str, Any]):
-        """Inspect dataset information."""
-        self.name_label.setText(dataset_info.get('name', 'Unknown'))
-        self.path_label.setText(str(dataset_info.get('path', '')))
-        self.classes_label.setText(str(dataset_info.get('num_classes', 0)))
-        self.images_label.setText(str(dataset_info.get('num_images', 0)))
+        """Inspect dataset information; applied on the next show if the inspector is hidden."""
+        self._pending = dataset_info
+        if self.isVisible():
+            self._flush_pending()
     
     def clear_inspection(self):
         """Clear dataset inspection."""
-        self.name_label.setText("No dataset selected")
-        self.path_label.setText("")
-        self.classes_label.setText("")
-        self.images_label.setText("")
+        self._pending = {}
+        if self.isVisible():
+            self._flush_pending()
+    
+    def showEvent(self, event):
+        self._flush_pending()
+        super().showEvent(event)
+    
+    def _flush_pending(self):
+        info = self._pending
+        if info is None:
+            return
+        self._pending = None
+        if info:
+            self.name_label.setText(info.get('name', 'Unknown'))
+            self.path_label.setText(str(info.get('path', '')))
+            self.classes_label.setText(str(info.get('num_classes', 0)))
+            self.images_label.setText(str(info.get('num_images', 0)))
+        else:
+            self.name_label.setText("No dataset selected")
+            self.path_label.setText("")
+            self.classes_label.setText("")
+            self.images_label.setText("")
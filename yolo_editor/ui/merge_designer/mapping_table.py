@@ -0,0 +1,216 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Tuple, Any
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PySide6.QtWidgets import QStyledItemDelegate, QSpinBox, QComboBox
+
+from ...core.merge_model import EdgeKey
+
+NO_LIMIT = 10_000_000
+
+class TargetsTableModel(QAbstractTableModel):
+    """Target classes: index (position), editable name and image quota."""
+    HEADERS = ["Index", "Name", "Quota (images)"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.targets: List[Dict[str, Any]] = []  # {"name": str, "quota": int}; index == row
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.targets)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        fl = super().flags(index)
+        if index.column() in (1, 2):
+            fl |= Qt.ItemIsEditable
+        return fl
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        t = self.targets[index.row()]
+        col = index.column()
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if col == 0: return index.row() if role == Qt.EditRole else str(index.row())
+            if col == 1: return t["name"]
+            if col == 2: return t["quota"] if role == Qt.EditRole else str(t["quota"])
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        t = self.targets[index.row()]
+        if index.column() == 1:
+            t["name"] = str(value)
+        elif index.column() == 2:
+            t["quota"] = int(value)
+        else:
+            return False
+        self.dataChanged.emit(index, index)
+        return True
+
+    def names(self) -> Dict[int, str]:
+        return {i: t["name"] for i, t in enumerate(self.targets)}
+
+    def add_target(self) -> int:
+        r = len(self.targets)
+        self.beginInsertRows(QModelIndex(), r, r)
+        self.targets.append({"name": f"class_{r}", "quota": 0})
+        self.endInsertRows()
+        return r
+
+    def remove_targets(self, rows) -> Dict[int, int]:
+        """Remove the given rows; returns old index -> new index for the remaining targets."""
+        doomed = set(rows)
+        if not doomed:
+            return {}
+        self.beginResetModel()
+        remap = {}
+        kept = []
+        for i, t in enumerate(self.targets):
+            if i in doomed: continue
+            remap[i] = len(kept)
+            kept.append(t)
+        self.targets = kept
+        self.endResetModel()
+        return remap
+
+class MappingTableModel(QAbstractTableModel):
+    """
+    Source class -> target mapping with per-edge limits. `state` is the canonical data,
+    keyed by (dataset_id, class_id); editors only exist while a cell is being edited.
+    """
+    HEADERS = ["Dataset", "Source ID", "Source Name", "Limit", "Target"]
+    COL_LIMIT = 3
+    COL_TARGET = 4
+
+    def __init__(self, targets: TargetsTableModel, parent=None):
+        super().__init__(parent)
+        self.targets = targets
+        self.rows: List[EdgeKey] = []
+        self.state: Dict[EdgeKey, dict] = {}  # {"name": str, "limit": int, "target": int | None}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        fl = super().flags(index)
+        if index.column() in (self.COL_LIMIT, self.COL_TARGET):
+            fl |= Qt.ItemIsEditable
+        return fl
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        key = self.rows[index.row()]
+        st = self.state[key]
+        col = index.column()
+        if role == Qt.EditRole:
+            if col == self.COL_LIMIT: return st["limit"]
+            if col == self.COL_TARGET: return st["target"]
+        if role == Qt.DisplayRole:
+            if col == 0: return key[0]
+            if col == 1: return str(key[1])
+            if col == 2: return st["name"]
+            if col == self.COL_LIMIT: return str(st["limit"])
+            if col == self.COL_TARGET:
+                tgt = st["target"]
+                if tgt is None or tgt >= len(self.targets.targets):
+                    return ""
+                return f"{tgt}: {self.targets.targets[tgt]['name']}"
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        st = self.state[self.rows[index.row()]]
+        if index.column() == self.COL_LIMIT:
+            st["limit"] = int(value)
+        elif index.column() == self.COL_TARGET:
+            st["target"] = int(value) if value is not None else None
+        else:
+            return False
+        self.dataChanged.emit(index, index)
+        return True
+
+    def _default_target(self) -> Optional[int]:
+        # every source class maps to the first target until the user picks another one
+        return 0 if self.targets.targets else None
+
+    def append_rows(self, rows: List[Tuple[str, int, str]]):
+        """Append (dataset_id, class_id, name) rows after the existing ones."""
+        rows = [r for r in rows if (r[0], r[1]) not in self.state]
+        if not rows:
+            return
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        default = self._default_target()
+        for dsid, cid, cname in rows:
+            key = (dsid, cid)
+            self.rows.append(key)
+            self.state[key] = {"name": cname, "limit": NO_LIMIT, "target": default}
+        self.endInsertRows()
+
+    def refresh_targets(self, remap: Optional[Dict[int, int]] = None):
+        """Re-point targets after the target list changed and repaint the Target column."""
+        default = self._default_target()
+        for st in self.state.values():
+            tgt = st["target"]
+            if remap is not None and tgt is not None:
+                tgt = remap.get(tgt)
+            st["target"] = tgt if tgt is not None else default
+        if self.rows:
+            self.dataChanged.emit(self.index(0, self.COL_TARGET), self.index(len(self.rows) - 1, self.COL_TARGET))
+
+class SpinBoxDelegate(QStyledItemDelegate):
+    def __init__(self, minimum: int = 0, maximum: int = NO_LIMIT, parent=None):
+        super().__init__(parent)
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def createEditor(self, parent, option, index):
+        spn = QSpinBox(parent)
+        spn.setRange(self.minimum, self.maximum)
+        return spn
+
+    def setEditorData(self, editor, index):
+        editor.setValue(int(index.data(Qt.EditRole) or 0))
+
+    def setModelData(self, editor, model, index):
+        editor.interpretText()
+        model.setData(index, editor.value(), Qt.EditRole)
+
+class TargetComboDelegate(QStyledItemDelegate):
+    """Target picker; the combo is filled from the targets model when the editor opens."""
+    def __init__(self, targets: TargetsTableModel, parent=None):
+        super().__init__(parent)
+        self.targets = targets
+
+    def createEditor(self, parent, option, index):
+        cmb = QComboBox(parent)
+        for idx, name in self.targets.names().items():
+            cmb.addItem(f"{idx}: {name}", idx)
+        return cmb
+
+    def setEditorData(self, editor, index):
+        i = editor.findData(index.data(Qt.EditRole))
+        if i >= 0:
+            editor.setCurrentIndex(i)
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentData(), Qt.EditRole)
@@ -1,17 +1,21 @@
 ﻿from __future__ import annotations
-from typing import Dict, List, Optional, Callable, Tuple, Any
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import List, Optional, Callable, Tuple, Any
+import cv2
+import numpy as np
 from PySide6.QtWidgets import (
     QGraphicsItem,
     QGraphicsRectItem,
     QGraphicsTextItem,
-    QGraphicsEllipseItem,
     QMenu,
     QStyleOptionGraphicsItem,
     QWidget,
-    QGraphicsDropShadowEffect,
+    QGraphicsPixmapItem,
+    QGraphicsView,
 )
-from PySide6.QtGui import QPen, QBrush, QColor, QPainter, QFont
-from PySide6.QtCore import Qt, QRectF, QPointF, Signal, QObject
+from PySide6.QtGui import QPen, QBrush, QColor, QPainter, QFont, QFontMetricsF, QPainterPath, QPixmap, QImage, QTransform, QSurfaceFormat
+from PySide6.QtCore import Qt, QRectF, QPointF
 
 SOURCE_BLOCK_COLOR = "#E1EFFE"
 TARGET_BLOCK_COLOR = "#E7F9ED"
@@ -23,31 +27,116 @@ TITLE_COLOR = "#111827"
 NODE_BACKGROUND = "#FFFFFF"
 NODE_BORDER = "#CBD5E1"
 
-
-class Port(QGraphicsEllipseItem):
-    """A connection port on a node."""
+# Shared drawing state; brushes and pens are built once at import.
+_SOURCE_PORT_BRUSH = QBrush(QColor(SOURCE_PORT_COLOR))
+_TARGET_PORT_BRUSH = QBrush(QColor(TARGET_PORT_COLOR))
+_PORT_PEN = QPen(QColor("#1f2933"), 1.6)
+_BLOCK_PEN = QPen(QColor("#cbd5e1"), 1)
+_NODE_BRUSH = QBrush(QColor(NODE_BACKGROUND))
+_NODE_PEN = QPen(QColor(NODE_BORDER), 1.6)
+_PLUS_BRUSH = QBrush(QColor("#dcfce7"))
+_PLUS_PEN = QPen(QColor("#16a34a"), 1)
+_TEXT_QCOLOR = QColor(TEXT_COLOR)
+_SUBTEXT_QCOLOR = QColor(SUBTEXT_COLOR)
+_TITLE_QCOLOR = QColor(TITLE_COLOR)
+_PLUS_TEXT_QCOLOR = QColor("#047857")
+
+
+@lru_cache(maxsize=None)
+def _brush(color: str) -> QBrush:
+    return QBrush(QColor(color))
+
+
+# Fonts need a QGuiApplication, and this module is imported before one exists,
+# so each one is built on first use and then shared.
+@lru_cache(maxsize=None)
+def _font(point_size: int, bold: bool = False) -> QFont:
+    font = QFont()
+    font.setPointSize(point_size)
+    font.setBold(bold)
+    return font
+
+
+@lru_cache(maxsize=None)
+def _metrics(point_size: int, bold: bool = False) -> QFontMetricsF:
+    return QFontMetricsF(_font(point_size, bold))
+
+
+# Port circle: 16px across, centred on the port position; the bounds leave room for the pen.
+_PORT_RECT = QRectF(-8, -8, 16, 16)
+_PORT_BOUNDS = QRectF(-9, -9, 18, 18)
+_PORT_SHAPE = QPainterPath()
+_PORT_SHAPE.addEllipse(_PORT_RECT)
+
+
+@lru_cache(maxsize=None)
+def _port_pixmap(role: str) -> QPixmap:
+    """The port circle rendered once per role (at 2x for high-DPI screens)."""
+    scale = 2
+    pix = QPixmap(int(_PORT_BOUNDS.width()) * scale, int(_PORT_BOUNDS.height()) * scale)
+    pix.setDevicePixelRatio(scale)
+    pix.fill(Qt.GlobalColor.transparent)
+    p = QPainter(pix)
+    p.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+    p.setBrush(_SOURCE_PORT_BRUSH if role == "source" else _TARGET_PORT_BRUSH)
+    p.setPen(_PORT_PEN)
+    p.drawEllipse(_PORT_RECT.translated(-_PORT_BOUNDS.left(), -_PORT_BOUNDS.top()))
+    p.end()
+    return pix
+
+
+# Node drop shadow, baked into a pixmap instead of a per-paint QGraphicsDropShadowEffect.
+SHADOW_BLUR = 22
+SHADOW_OFFSET_Y = 6
+SHADOW_ALPHA = 60
+_SHADOW_BUCKET = 16  # shadows are rendered for sizes rounded up to this step and scaled to fit
+
+
+@lru_cache(maxsize=64)
+def _shadow_pixmap(w_buckets: int, h_buckets: int) -> QPixmap:
+    """Blurred black rectangle with SHADOW_BLUR padding on every side."""
+    w, h = w_buckets * _SHADOW_BUCKET, h_buckets * _SHADOW_BUCKET
+    pad = SHADOW_BLUR
+    alpha = np.zeros((h + 2 * pad, w + 2 * pad), dtype=np.uint8)
+    alpha[pad:pad + h, pad:pad + w] = SHADOW_ALPHA
+    alpha = cv2.GaussianBlur(alpha, (0, 0), SHADOW_BLUR / 2)
+    bgra = np.zeros(alpha.shape + (4,), dtype=np.uint8)  # black, so premultiplied colour stays 0
+    bgra[..., 3] = alpha
+    img = QImage(bgra.data, bgra.shape[1], bgra.shape[0], bgra.strides[0], QImage.Format.Format_ARGB32_Premultiplied)
+    return QPixmap.fromImage(img.copy())
+
+
+def _title_font() -> QFont: return _font(12, True)
+def _block_font() -> QFont: return _font(11, True)
+def _sub_font() -> QFont: return _font(9)
+def _plus_font() -> QFont: return _font(14, True)
+
+
+class Port(QGraphicsItem):
+    """A connection port on a node, drawn from a shared per-role pixmap."""
     
     def __init__(self, role: str, key: Any, parent=None):
-        super().__init__(-8, -8, 16, 16, parent)
+        super().__init__(parent)
         self.role = role  # "source" or "target"
         self.key = key    # identifier for this port
-        color = SOURCE_PORT_COLOR if role == "source" else TARGET_PORT_COLOR
-        self.setBrush(QBrush(QColor(color)))
-        self.setPen(QPen(QColor("#1f2933"), 1.6))
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
         self.setZValue(10)
     
-    def mousePressEvent(self, event):
-        # Let the canvas handle port interactions
-        if hasattr(self.scene(), 'views') and self.scene().views():
-            view = self.scene().views()[0]
-            if hasattr(view, 'parent') and hasattr(view.parent(), 'mousePressOnPort'):
-                view.parent().mousePressOnPort(self)
-        super().mousePressEvent(event)
+    def boundingRect(self) -> QRectF:
+        return _PORT_BOUNDS
+    
+    def shape(self) -> QPainterPath:
+        return _PORT_SHAPE
+    
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: Optional[QWidget] = None):
+        painter.drawPixmap(_PORT_BOUNDS.topLeft(), _port_pixmap(self.role))
 
 
 class ClassBlock(QGraphicsRectItem):
-    """A class block within a node."""
+    """A class block within a node; its text is painted directly rather than held in child items."""
+
+    # QGraphicsTextItem used to add a 4px document margin around each text; kept for identical layout
+    _TEXT_MARGIN = 4
 
     def __init__(self, text: str, subtext: str = "", role: str = "source",
                  key: Any = None, color: str = "#E2E8F0", parent=None):
@@ -56,71 +145,87 @@ class ClassBlock(QGraphicsRectItem):
         self.key = key
         self._text = text
         self._subtext = subtext
+        self._show_subtext = bool(subtext)
         self._color = color
         self._on_double_click: Optional[Callable] = None
         self._context_menu_factory: Optional[Callable[[], QMenu]] = None
+        self._text_sizes: Optional[Tuple[float, float, float, float]] = None  # as of the last _layout
+        self._text_rect = QRectF()
+        self._subtext_rect = QRectF()
+        self._port_rel = (-1.0, -1.0)  # port position last set by _layout
 
         self.port = Port(role, key, self)
 
-        self.text_item = QGraphicsTextItem(text, self)
-        self.text_item.setDefaultTextColor(QColor(TEXT_COLOR))
-        self.subtext_item = QGraphicsTextItem(subtext, self) if subtext else None
-        if self.subtext_item:
-            self.subtext_item.setDefaultTextColor(QColor(SUBTEXT_COLOR))
-
-        self.setBrush(QBrush(QColor(color)))
-        self.setPen(QPen(QColor("#cbd5e1"), 1))
+        self.setBrush(_brush(color))
+        self.setPen(_BLOCK_PEN)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
 
         self._layout()
 
     def _layout(self):
         """Layout the text and port within the block."""
-        font = QFont()
-        font.setPointSize(11)
-        font.setBold(True)
-        self.text_item.setFont(font)
-        self.text_item.setDefaultTextColor(QColor(TEXT_COLOR))
+        text_w, text_h, sub_w, sub_h = self._measure_text()
 
-        if self.subtext_item:
-            subfont = QFont()
-            subfont.setPointSize(9)
-            self.subtext_item.setFont(subfont)
-            self.subtext_item.setDefaultTextColor(QColor(SUBTEXT_COLOR))
-
-        text_rect = self.text_item.boundingRect()
-        subtext_rect = self.subtext_item.boundingRect() if self.subtext_item else QRectF()
-
-        width = max(text_rect.width(), subtext_rect.width()) + 48
-        height = text_rect.height() + (subtext_rect.height() if self.subtext_item else 0) + 24
+        width = max(text_w, sub_w) + 48
+        height = text_h + sub_h + 24
 
         self.setRect(0, 0, width, height)
 
-        self.text_item.setPos(18, 6)
-        if self.subtext_item:
-            self.subtext_item.setPos(18, text_rect.height() + 8)
-
-        if self.role == "source":
-            self.port.setPos(width - 10, height / 2)
-        else:
-            self.port.setPos(10, height / 2)
+        m = self._TEXT_MARGIN
+        self._text_rect = QRectF(18 + m, 6 + m, text_w - 2 * m, text_h - 2 * m)
+        if self._show_subtext:
+            self._subtext_rect = QRectF(18 + m, text_h + 8 + m, sub_w - 2 * m, sub_h - 2 * m)
+
+        port_rel = (width - 10, height / 2) if self.role == "source" else (10, height / 2)
+        if port_rel != self._port_rel:
+            self.port.setPos(*port_rel)
+            self._port_rel = port_rel
+        self._text_sizes = (text_w, text_h, sub_w, sub_h)
+
+    def _measure_text(self) -> Tuple[float, float, float, float]:
+        m2 = 2 * self._TEXT_MARGIN
+        size = _metrics(11, True).size(0, self._text)
+        if not self._show_subtext:
+            return (size.width() + m2, size.height() + m2, 0.0, 0.0)
+        sub = _metrics(9).size(0, self._subtext)
+        return (size.width() + m2, size.height() + m2, sub.width() + m2, sub.height() + m2)
+
+    def _relayout_if_needed(self) -> bool:
+        """Re-run _layout only if the text changed size; the parent node is told when it did."""
+        if self._measure_text() == self._text_sizes:
+            self.update()  # same geometry, new text
+            return False
+        self._layout()
+        node = self.parentItem()
+        if isinstance(node, NodeItem):
+            node.invalidate_layout()
+        return True
+
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: Optional[QWidget] = None):
+        super().paint(painter, option, widget)
+        painter.setFont(_block_font())
+        painter.setPen(_TEXT_QCOLOR)
+        painter.drawText(self._text_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop, self._text)
+        if self._show_subtext:
+            painter.setFont(_sub_font())
+            painter.setPen(_SUBTEXT_QCOLOR)
+            painter.drawText(self._subtext_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop, self._subtext)
 
     def set_title(self, text: str):
         """Update the main text."""
+        if text == self._text:
+            return
         self._text = text
-        self.text_item.setPlainText(text)
-        self.text_item.setDefaultTextColor(QColor(TEXT_COLOR))
-        self._layout()
+        self._relayout_if_needed()
 
     def set_subtext(self, text: str):
         """Update the subtext."""
+        if text == self._subtext and self._show_subtext:
+            return
         self._subtext = text
-        if not self.subtext_item:
-            self.subtext_item = QGraphicsTextItem(text, self)
-        else:
-            self.subtext_item.setPlainText(text)
-        self.subtext_item.setDefaultTextColor(QColor(SUBTEXT_COLOR))
-        self._layout()
+        self._show_subtext = True
+        self._relayout_if_needed()
 
     def set_on_double_click(self, callback: Callable):
         """Set double-click callback."""
@@ -143,8 +248,6 @@ class ClassBlock(QGraphicsRectItem):
         super().contextMenuEvent(event)
 
 
-
-
 class _PlusButton(QGraphicsRectItem):
     """Small interactive plus button rendered inside target nodes."""
 
@@ -152,19 +255,16 @@ class _PlusButton(QGraphicsRectItem):
         super().__init__(parent)
         self._callback = callback
         self.setRect(0, 0, 24, 24)
-        self.setBrush(QBrush(QColor("#dcfce7")))
-        self.setPen(QPen(QColor("#16a34a"), 1))
+        self.setBrush(_PLUS_BRUSH)
+        self.setPen(_PLUS_PEN)
         self.setZValue(20)
         self.setCursor(Qt.CursorShape.PointingHandCursor)
 
-        self._label = QGraphicsTextItem("+", self)
-        font = QFont()
-        font.setPointSize(14)
-        font.setBold(True)
-        self._label.setFont(font)
-        self._label.setDefaultTextColor(QColor("#047857"))
-        br = self._label.boundingRect()
-        self._label.setPos((24 - br.width()) / 2, (24 - br.height()) / 2 - 2)
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: Optional[QWidget] = None):
+        super().paint(painter, option, widget)
+        painter.setFont(_plus_font())
+        painter.setPen(_PLUS_TEXT_QCOLOR)
+        painter.drawText(self.rect().translated(0, -2), Qt.AlignmentFlag.AlignCenter, "+")
 
     def set_callback(self, callback: Callable[[], None]):
         self._callback = callback
@@ -184,24 +284,24 @@ class NodeItem(QGraphicsRectItem):
         self.blocks: List[ClassBlock] = []
         self._plus_callback: Optional[Callable] = None
         self._plus_button: Optional[_PlusButton] = None
+        self._layout_dirty = True
+        self._laid_out_blocks = -1  # len(self.blocks) at the last relayout
+        self._batch_depth = 0
         
         # Create title text
         self.title_item = QGraphicsTextItem(title, self)
-        font = QFont()
-        font.setPointSize(12)
-        font.setBold(True)
-        self.title_item.setFont(font)
-        self.title_item.setDefaultTextColor(QColor(TITLE_COLOR))
+        self.title_item.setFont(_title_font())
+        self.title_item.setDefaultTextColor(_TITLE_QCOLOR)
         
         # Style the node
-        self.setBrush(QBrush(QColor(NODE_BACKGROUND)))
-        self.setPen(QPen(QColor(NODE_BORDER), 1.6))
-
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setOffset(0, 6)
-        shadow.setBlurRadius(22)
-        shadow.setColor(QColor(0, 0, 0, 60))
-        self.setGraphicsEffect(shadow)
+        self.setBrush(_NODE_BRUSH)
+        self.setPen(_NODE_PEN)
+
+        self._shadow = QGraphicsPixmapItem(self)
+        self._shadow.setFlag(QGraphicsItem.GraphicsItemFlag.ItemStacksBehindParent, True)
+        self._shadow.setAcceptedMouseButtons(Qt.MouseButton.NoButton)
+        # the node body only changes when relayout resizes it, so paint it once into a device pixmap
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, True)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
         
@@ -212,7 +312,7 @@ class NodeItem(QGraphicsRectItem):
                        key: Any = None, color: Optional[str] = None,
                        on_double_click: Optional[Callable] = None,
                        context_menu_factory: Optional[Callable[[], QMenu]] = None) -> ClassBlock:
-        """Add a class block to this node."""
+        """Add a class block to this node; the caller relayouts (directly or via bulk_add)."""
         palette_color = color
         if palette_color is None:
             if role == "source":
@@ -228,7 +328,7 @@ class NodeItem(QGraphicsRectItem):
             block.set_context_menu_factory(context_menu_factory)
         
         self.blocks.append(block)
-        self.relayout()
+        self.invalidate_layout()
         return block
     
     def enable_plus(self, callback: Callable):
@@ -238,16 +338,51 @@ class NodeItem(QGraphicsRectItem):
             self._plus_button = _PlusButton(self, self._invoke_plus)
         else:
             self._plus_button.set_callback(self._invoke_plus)
+        self.invalidate_layout()
         self.relayout()
 
     def _invoke_plus(self):
         if self._plus_callback:
             self._plus_callback()
 
+    def begin_batch(self):
+        """Suspend relayout while many blocks are added or changed; the scene's index method is
+        left alone (MergeScene.tune_index owns it, and each switch rebuilds the whole index)."""
+        self._batch_depth += 1
+
+    def end_batch(self):
+        """Relayout once; pairs with begin_batch."""
+        if self._batch_depth == 0:
+            return
+        self._batch_depth -= 1
+        if self._batch_depth:
+            return
+        self.relayout()
+
+    @contextmanager
+    def bulk_add(self):
+        """`with node.bulk_add():` add or update many blocks with a single relayout at the end."""
+        self.begin_batch()
+        try:
+            yield self
+        finally:
+            self.end_batch()
+
+    def invalidate_layout(self):
+        """Force the next relayout() to run even if no block was added or removed."""
+        self._layout_dirty = True
+
     def relayout(self):
         """Relayout all blocks within the node."""
         if not self.blocks and not self.title_item:
             return
+        if self._batch_depth:
+            return  # end_batch relayouts
+        # blocks may also be removed from self.blocks directly, so the count is checked too
+        if not self._layout_dirty and len(self.blocks) == self._laid_out_blocks:
+            return
+        self._layout_dirty = False
+        self._laid_out_blocks = len(self.blocks)
 
         title_rect = self.title_item.boundingRect()
         self.title_item.setPos(16, 14)
@@ -262,7 +397,10 @@ class NodeItem(QGraphicsRectItem):
             max_width = max(max_width, block_rect.width() + 32)
 
         total_height = y_offset + 16
-        self.setRect(0, 0, max_width, total_height)
+        rect = self.rect()
+        if rect.width() != max_width or rect.height() != total_height:
+            self.setRect(0, 0, max_width, total_height)  # also invalidates the cached pixmap
+            self._update_shadow()
 
         if self._plus_button:
             visible = self.kind == "target" and self._plus_callback is not None
@@ -271,6 +409,19 @@ class NodeItem(QGraphicsRectItem):
                 rect = self._plus_button.rect()
                 self._plus_button.setPos(self.rect().width() - rect.width() - 16, 16)
 
+    def _update_shadow(self):
+        rect = self.rect()
+        if rect.width() <= 0 or rect.height() <= 0:
+            self._shadow.setVisible(False)
+            return
+        wb = -(-int(rect.width()) // _SHADOW_BUCKET)
+        hb = -(-int(rect.height()) // _SHADOW_BUCKET)
+        sx = rect.width() / (wb * _SHADOW_BUCKET)
+        sy = rect.height() / (hb * _SHADOW_BUCKET)
+        self._shadow.setPixmap(_shadow_pixmap(wb, hb))
+        self._shadow.setTransform(QTransform.fromScale(sx, sy))
+        self._shadow.setPos(-SHADOW_BLUR * sx, -SHADOW_BLUR * sy + SHADOW_OFFSET_Y)
+        self._shadow.setVisible(True)
 
     def remove_block(self, block: ClassBlock):
         """Remove a block from this node."""
@@ -278,4 +429,25 @@ class NodeItem(QGraphicsRectItem):
             self.blocks.remove(block)
             if block.scene():
                 block.scene().removeItem(block)
+            self.invalidate_layout()
             self.relayout()
+
+
+def use_opengl(view: QGraphicsView, samples: int = 4) -> bool:
+    """
+    Opt-in: render `view` through a multisampled QOpenGLWidget viewport. SmartViewportUpdate
+    is used because a GL viewport repaints whole frames anyway; with the raster viewport keep
+    Minimal/BoundingRect updates instead of FullViewportUpdate. Returns False if Qt was built
+    without OpenGL widgets.
+    """
+    try:
+        from PySide6.QtOpenGLWidgets import QOpenGLWidget
+    except ImportError:
+        return False
+    fmt = QSurfaceFormat()
+    fmt.setSamples(samples)
+    gl = QOpenGLWidget()
+    gl.setFormat(fmt)
+    view.setViewport(gl)
+    view.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.SmartViewportUpdate)
+    return True
@@ -4,7 +4,7 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QListWidget, QListWidgetItem,
     QPushButton, QHBoxLayout, QSpinBox, QLineEdit
 )
-from PySide6.QtCore import Signal
+from PySide6.QtCore import Signal, Slot
 
 
 class MergePalette(QWidget):
@@ -29,9 +29,9 @@ class MergePalette(QWidget):
         # Top controls
         top_row = QHBoxLayout()
         self.btn_load = QPushButton("Load Dataset...")
-        self.btn_load.clicked.connect(lambda: self.requestLoadDataset.emit())
+        self.btn_load.clicked.connect(self.requestLoadDataset)
         self.btn_export = QPushButton("Export Merged...")
-        self.btn_export.clicked.connect(lambda: self.requestExportMerged.emit())
+        self.btn_export.clicked.connect(self.requestExportMerged)
         top_row.addWidget(self.btn_load)
         top_row.addWidget(self.btn_export)
         lay.addLayout(top_row)
@@ -39,7 +39,7 @@ class MergePalette(QWidget):
         lay.addWidget(QLabel("Datasets"))
         self.list = QListWidget()
         self.list.itemSelectionChanged.connect(self._update_buttons)
-        self.list.itemDoubleClicked.connect(lambda *_: self._spawn_selected_dataset())
+        self.list.itemDoubleClicked.connect(self._spawn_dataset_item)
         lay.addWidget(self.list)
 
         btn_row = QHBoxLayout()
@@ -73,15 +73,22 @@ class MergePalette(QWidget):
         self._update_buttons()
 
     # callbacks
+    @Slot()
     def _update_buttons(self):
         self.btn_add_ds.setEnabled(self.list.currentItem() is not None)
 
+    @Slot()
     def _spawn_selected_dataset(self):
         it = self.list.currentItem()
         if not it:
             return
         self._on_spawn_dataset(it.text())
 
+    @Slot(QListWidgetItem)
+    def _spawn_dataset_item(self, item: QListWidgetItem):
+        self._on_spawn_dataset(item.text())
+
+    @Slot()
     def _spawn_target(self):
         name = self.name_edit.text().strip()
         quota = int(self.quota.value())
@@ -1,26 +1,222 @@
 from __future__ import annotations
+from bisect import bisect_left
+
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QHeaderView, QTextEdit, QGroupBox
+    QWidget, QVBoxLayout, QLabel, QTableView, QHeaderView, QTextEdit, QGroupBox
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QObject, QRunnable, QThreadPool, Signal, Slot
+from PySide6.QtGui import QBrush, QColor
+
+from ..table_utils import frozen
+
+_RED = QBrush(QColor(220, 20, 20))  # targets short of their quota
+
+class _PreviewRowsModel(QAbstractTableModel):
+    """Read-only table over plain row tuples kept sorted by row_key; updated through apply_delta."""
+    HEADERS: list[str] = []
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: list[tuple] = []
+        self._keys: list = []  # row_key of each row, kept sorted
+        self._row_of: dict = {}  # row_key -> row number
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self._display(self._rows[index.row()], index.column())
+        if role == Qt.ForegroundRole:
+            return self._foreground(self._rows[index.row()], index.column())
+        return None
+
+    @staticmethod
+    def row_key(row: tuple):
+        return row[0]
+
+    def apply_delta(self, rows: list[tuple], upserts: list[tuple], removed: list):
+        """Move to rows (sorted by row_key) given only what changed: upserts are new or changed
+        rows, removed the keys that are gone. Big deltas fall back to a model reset."""
+        if not self._rows or len(removed) + len(upserts) > len(rows) // 2:
+            self.beginResetModel()
+            self._set_snapshot(rows)
+            self.endResetModel()
+            return
+        for r in sorted((self._row_of[k] for k in removed), reverse=True):
+            self.beginRemoveRows(QModelIndex(), r, r)
+            del self._rows[r]
+            del self._keys[r]
+            self.endRemoveRows()
+        if removed:
+            self._row_of = {k: i for i, k in enumerate(self._keys)}
+        last_col = len(self.HEADERS) - 1
+        added = []
+        for row in upserts:
+            k = self.row_key(row)
+            r = self._row_of.get(k)
+            if r is None:
+                added.append((k, row))
+                continue
+            self._rows[r] = row
+            self.dataChanged.emit(self.index(r, 0), self.index(r, last_col))
+        for k, row in added:
+            r = bisect_left(self._keys, k)
+            self.beginInsertRows(QModelIndex(), r, r)
+            self._rows.insert(r, row)
+            self._keys.insert(r, k)
+            self.endInsertRows()
+        if added:
+            self._row_of = {k: i for i, k in enumerate(self._keys)}
+
+    def _set_snapshot(self, rows: list[tuple]):
+        self._rows = list(rows)
+        self._keys = [self.row_key(row) for row in self._rows]
+        self._row_of = {k: i for i, k in enumerate(self._keys)}
+
+    def _display(self, row: tuple, col: int):
+        return str(row[col])
+
+    def _foreground(self, row: tuple, col: int):
+        return None
+
+class PreviewTargetsModel(_PreviewRowsModel):
+    """Rows: (target_id, name, supply, selected, quota)."""
+    HEADERS = ["Target Index", "Name", "Supply", "Selected / Quota"]
+
+    def _display(self, row, col):
+        t, name, supply, selected, quota = row
+        if col == 0: return str(t)
+        if col == 1: return name
+        if col == 2: return str(supply)
+        return f"{selected} / {quota}"
+
+    def _foreground(self, row, col):
+        if col == 3 and row[3] < row[4]:
+            return _RED
+        return None
+
+class PreviewEdgesModel(_PreviewRowsModel):
+    """Rows: (target_id, target_name, dataset_id, source_class_id, taken, supply)."""
+    HEADERS = ["Target", "Dataset ID", "Source Class ID", "Selected / Supply"]
+
+    def _display(self, row, col):
+        t, tname, dsid, src_cls, taken, supply = row
+        if col == 0: return f"{t} ({tname})"
+        if col == 1: return str(dsid)
+        if col == 2: return str(src_cls)
+        return f"{taken} / {supply}"
+
+    @staticmethod
+    def row_key(row):
+        return (row[0], row[2], row[3])
+
+def _bake_preview(preview_supply: dict, preview_edges: dict, warnings: list[str],
+                  target_names: dict[int, str]) -> tuple[list, list, str]:
+    """Plain-Python row tuples and warning text for a preview; safe to run off the GUI thread."""
+    supply_items = [(int(k), stats) for k, stats in preview_supply.items()]
+    supply_items.sort(key=lambda kv: kv[0])
+    target_rows = []
+    for t, stats in supply_items:
+        name = target_names.get(t, f"target-{t}")
+        supply = stats.get("supply", 0)
+        selected = stats.get("selected", 0)
+        quota = stats.get("quota", supply)
+        target_rows.append((t, name, supply, selected, quota))
+
+    edge_rows = []
+    for t, rows in [(int(k), rows) for k, rows in preview_edges.items()]:
+        tname = target_names.get(t, f"target-{t}")
+        for edge, supply, taken in rows:
+            dsid, src_cls = edge
+            edge_rows.append((t, tname, dsid, src_cls, taken, supply))
+    edge_rows.sort(key=PreviewEdgesModel.row_key)
+
+    warn_text = "\n".join(warnings) if warnings else "No warnings."
+    return target_rows, edge_rows, warn_text
+
+def _row_delta(old_rows: list[tuple], new_rows: list[tuple], key) -> tuple[list, list]:
+    """(upserts, removed keys) that take old_rows to new_rows."""
+    old_by_key = {key(row): row for row in old_rows}
+    new_keys = set()
+    upserts = []
+    for row in new_rows:
+        k = key(row)
+        new_keys.add(k)
+        if old_by_key.get(k) != row:
+            upserts.append(row)
+    removed = [k for k in old_by_key if k not in new_keys]
+    return upserts, removed
+
+class _BakeSignals(QObject):
+    # generation, (target_rows, upserts, removed), (edge_rows, upserts, removed), warn_text
+    done = Signal(int, object, object, str)
+
+class PreviewBakeWorker(QRunnable):
+    """Builds preview rows on the thread pool; results come back through signals.done."""
+
+    def __init__(self, generation: int, signals: _BakeSignals, preview_supply: dict,
+                 preview_edges: dict, warnings: list[str], target_names: dict[int, str],
+                 shown: tuple[list, list]):
+        super().__init__()
+        self.generation = generation
+        self.signals = signals
+        self._args = (preview_supply, preview_edges, warnings, target_names)
+        self._shown = shown  # (target_rows, edge_rows) the tables show now; diffed against
+
+    def run(self):
+        target_rows, edge_rows, warn_text = _bake_preview(*self._args)
+        shown_targets, shown_edges = self._shown
+        targets = (target_rows, *_row_delta(shown_targets, target_rows, PreviewTargetsModel.row_key))
+        edges = (edge_rows, *_row_delta(shown_edges, edge_rows, PreviewEdgesModel.row_key))
+        self.signals.done.emit(self.generation, targets, edges, warn_text)
 
 class PreviewPanel(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
-        root = QVBoxLayout(self)
+        self._root = QVBoxLayout(self)
+        # tables and warnings view are built on first show; see _build_ui
+        self.targets_model: PreviewTargetsModel | None = None
+        self.tbl_targets: QTableView | None = None
+        self.edges_model: PreviewEdgesModel | None = None
+        self.tbl_edges: QTableView | None = None
+        self.txt_warn: QTextEdit | None = None
+
+        self._target_names = {}
+        self._pending: tuple | None = None  # latest (supply, edges, warnings) received while hidden
+        self._last_warn_text = ""  # what txt_warn currently shows
+        self._bake_gen = 0  # only the newest bake result is applied
+        self._shown: tuple[list, list] = ([], [])  # baked rows last applied; never mutated
+        self._bake_signals = _BakeSignals(self)
+        self._bake_signals.done.connect(self._on_baked, Qt.QueuedConnection)
+
+    def _build_ui(self):
+        root = self._root
 
         self.group_targets = QGroupBox("Targets Overview")
         gl = QVBoxLayout(self.group_targets)
-        self.tbl_targets = QTableWidget(0, 4)
-        self.tbl_targets.setHorizontalHeaderLabels(["Target Index", "Name", "Supply", "Selected / Quota"])
+        self.targets_model = PreviewTargetsModel(self)
+        self.tbl_targets = QTableView()
+        self.tbl_targets.setModel(self.targets_model)
         self.tbl_targets.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         gl.addWidget(self.tbl_targets)
         root.addWidget(self.group_targets)
 
         self.group_edges = QGroupBox("Edges (Per Source Class)")
         gl2 = QVBoxLayout(self.group_edges)
-        self.tbl_edges = QTableWidget(0, 4)
-        self.tbl_edges.setHorizontalHeaderLabels(["Target", "Dataset ID", "Source Class ID", "Selected / Supply"])
+        self.edges_model = PreviewEdgesModel(self)
+        self.tbl_edges = QTableView()
+        self.tbl_edges.setModel(self.edges_model)
         self.tbl_edges.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         gl2.addWidget(self.tbl_edges)
         root.addWidget(self.group_edges)
@@ -32,38 +228,43 @@ class PreviewPanel(QWidget):
         root.addWidget(self.txt_warn)
         root.addStretch(1)
 
-        self._target_names = {}
-
     def set_target_names(self, names_dict: dict[int, str]):
-        self._target_names = dict(names_dict)
+        """Use names_dict as the target-name lookup; it is kept by reference, so pass a fresh dict rather than mutating it."""
+        self._target_names = names_dict
 
     def set_preview(self, preview_supply: dict, preview_edges: dict, warnings: list[str]):
-        self.tbl_targets.setRowCount(0)
-        for k, stats in sorted(preview_supply.items(), key=lambda kv: int(kv[0]) if isinstance(kv[0], str) else kv[0]):
-            t = int(k) if isinstance(k, str) else k
-            r = self.tbl_targets.rowCount(); self.tbl_targets.insertRow(r)
-            name = self._target_names.get(t, f"target-{t}")
-            supply = stats.get("supply", 0)
-            selected = stats.get("selected", 0)
-            quota = stats.get("quota", supply)
-            self.tbl_targets.setItem(r, 0, QTableWidgetItem(str(t)))
-            self.tbl_targets.setItem(r, 1, QTableWidgetItem(name))
-            self.tbl_targets.setItem(r, 2, QTableWidgetItem(str(supply)))
-            it = QTableWidgetItem(f"{selected} / {quota}")
-            if selected < quota: it.setForeground(Qt.red)
-            self.tbl_targets.setItem(r, 3, it)
-
-        self.tbl_edges.setRowCount(0)
-        for k, rows in preview_edges.items():
-            t = int(k) if isinstance(k, str) else k
-            tname = self._target_names.get(t, f"target-{t}")
-            for edge, supply, taken in rows:
-                dsid, src_cls = edge
-                r = self.tbl_edges.rowCount(); self.tbl_edges.insertRow(r)
-                self.tbl_edges.setItem(r, 0, QTableWidgetItem(f"{t} ({tname})"))
-                self.tbl_edges.setItem(r, 1, QTableWidgetItem(str(dsid)))
-                self.tbl_edges.setItem(r, 2, QTableWidgetItem(str(src_cls)))
-                self.tbl_edges.setItem(r, 3, QTableWidgetItem(f"{taken} / {supply}"))
-
-        self.txt_warn.clear()
-        self.txt_warn.setPlainText("\n".join(warnings) if warnings else "No warnings.")
+        """Show a preview; while the panel is hidden (or not yet built) only the latest one is kept, for showEvent."""
+        if not self.isVisible() or self.tbl_targets is None:
+            self._pending = (preview_supply, preview_edges, warnings)
+            return
+        self._pending = None
+        self._apply_preview(preview_supply, preview_edges, warnings)
+
+    def showEvent(self, event):
+        if self.tbl_targets is None:
+            self._build_ui()
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            self._apply_preview(*pending)
+        super().showEvent(event)
+
+    def _apply_preview(self, preview_supply: dict, preview_edges: dict, warnings: list[str]):
+        self._bake_gen += 1
+        QThreadPool.globalInstance().start(PreviewBakeWorker(
+            self._bake_gen, self._bake_signals, preview_supply, preview_edges, warnings,
+            self._target_names, self._shown))
+
+    @Slot(int, object, object, str)
+    def _on_baked(self, generation: int, targets: tuple, edges: tuple, warn_text: str):
+        # only the newest bake is applied, and _shown changes only here, so its delta is
+        # always against what the tables show
+        if generation != self._bake_gen:
+            return  # a newer preview is already being baked
+        with frozen(self.tbl_targets):
+            self.targets_model.apply_delta(*targets)
+        with frozen(self.tbl_edges):
+            self.edges_model.apply_delta(*edges)
+        self._shown = (targets[0], edges[0])
+        if warn_text != self._last_warn_text:
+            self.txt_warn.setPlainText(warn_text)
+            self._last_warn_text = warn_text
@@ -7,8 +7,19 @@ class SceneSignals(QObject):
     edgeRemoved = Signal(object)   # EdgeItem
 
 class MergeScene(QGraphicsScene):
+    BSP_INDEX_THRESHOLD = 50  # below this many items a linear scan beats maintaining the BSP tree
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.sigs = SceneSignals()
         # Set up scene for better interaction
         self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+
+    def tune_index(self, n_items: int):
+        """Use a BSP tree for hit-testing once the scene holds more than BSP_INDEX_THRESHOLD items."""
+        if n_items > self.BSP_INDEX_THRESHOLD:
+            method = QGraphicsScene.ItemIndexMethod.BspTreeIndex
+        else:
+            method = QGraphicsScene.ItemIndexMethod.NoIndex
+        if self.itemIndexMethod() != method:
+            self.setItemIndexMethod(method)
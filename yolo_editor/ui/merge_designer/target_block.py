@@ -1,7 +1,99 @@
 from __future__ import annotations
-from typing import List, Dict, Any, Optional
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QListWidget, QListWidgetItem, QPushButton, QHBoxLayout, QSpinBox
-from PySide6.QtCore import Qt, Signal
+from typing import List, Dict, Any, Optional, Tuple
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QListView, QPushButton, QHBoxLayout, QSpinBox, QStyledItemDelegate, QStyle
+from PySide6.QtCore import Qt, Signal, Slot, QTimer, QAbstractListModel, QModelIndex, QRect, QSize
+
+def _title_text(name: str, target_id: int, quota: Optional[int]) -> str:
+    quota_text = f" (quota: {quota})" if quota else " (unlimited)"
+    return f"{name} [{target_id}]{quota_text}"
+
+def _stats_text(images: int, boxes: int) -> str:
+    return f"{images} images, {boxes} boxes"
+
+class TargetListModel(QAbstractListModel):
+    """One row per target, (target_id, name, quota, images, boxes), in the order targets were added."""
+    NameRole = Qt.ItemDataRole.UserRole + 1
+    IdRole = Qt.ItemDataRole.UserRole + 2
+    ImagesRole = Qt.ItemDataRole.UserRole + 3
+    BoxesRole = Qt.ItemDataRole.UserRole + 4
+    QuotaRole = Qt.ItemDataRole.UserRole + 5
+    _FIELD_ROLES = {IdRole: 0, NameRole: 1, QuotaRole: 2, ImagesRole: 3, BoxesRole: 4}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[Tuple[int, str, Optional[int], int, int]] = []
+        self._row_of: Dict[int, int] = {}  # target_id -> row
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        field = self._FIELD_ROLES.get(role)
+        if field is not None:
+            return row[field]
+        if role == Qt.ItemDataRole.UserRole:
+            return row[0]
+        if role == Qt.ItemDataRole.DisplayRole:
+            target_id, name, quota, images, boxes = row
+            return f"{_title_text(name, target_id, quota)}\n  {_stats_text(images, boxes)}"
+        return None
+
+    def set_row(self, target_id: int, name: str, quota: Optional[int], images: int, boxes: int):
+        """Append a row for a new target, or update its fields if any changed."""
+        values = (target_id, name, quota, images, boxes)
+        row = self._row_of.get(target_id)
+        if row is None:
+            row = len(self._rows)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._rows.append(values)
+            self._row_of[target_id] = row
+            self.endInsertRows()
+        elif self._rows[row] != values:
+            self._rows[row] = values
+            idx = self.index(row)
+            self.dataChanged.emit(idx, idx)
+
+    def remove_row(self, target_id: int):
+        row = self._row_of.pop(target_id, None)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        self.endRemoveRows()
+        for r in range(row, len(self._rows)):
+            self._row_of[self._rows[r][0]] = r
+
+    def clear(self):
+        self.beginResetModel()
+        self._rows.clear()
+        self._row_of.clear()
+        self.endResetModel()
+
+class TargetItemDelegate(QStyledItemDelegate):
+    """Draws a target row as a title line and a stats line at a fixed height, without text layout."""
+    ROW_HEIGHT = 40
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+            painter.setPen(option.palette.highlightedText().color())
+        else:
+            painter.setPen(option.palette.text().color())
+        r = option.rect.adjusted(4, 2, -4, -2)
+        half = r.height() // 2
+        align = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+        title = _title_text(index.data(TargetListModel.NameRole), index.data(TargetListModel.IdRole), index.data(TargetListModel.QuotaRole))
+        painter.drawText(QRect(r.x(), r.y(), r.width(), half), align, title)
+        stats = _stats_text(index.data(TargetListModel.ImagesRole), index.data(TargetListModel.BoxesRole))
+        painter.drawText(QRect(r.x() + 8, r.y() + half, r.width() - 8, r.height() - half), align, stats)
+        painter.restore()
 
 class TargetBlock(QWidget):
     """Widget for displaying and managing target classes in merge designer."""
@@ -16,6 +108,11 @@ class TargetBlock(QWidget):
         self.setup_ui()
         self.targets: Dict[int, Dict[str, Any]] = {}
         self._next_id = 0
+        # targets added, changed or removed since the last display update, in the order they were touched
+        self._dirty_ids: Dict[int, None] = {}
+        self._total_images = 0
+        self._total_boxes = 0
+        self._refresh_pending = False  # a _flush_display is queued for the next event-loop pass
     
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -32,9 +129,13 @@ class TargetBlock(QWidget):
         layout.addLayout(header_layout)
         
         # Target list
-        self.targets_list = QListWidget()
+        self.targets_model = TargetListModel(self)
+        self.targets_list = QListView()
+        self.targets_list.setModel(self.targets_model)
+        self.targets_list.setItemDelegate(TargetItemDelegate(self.targets_list))
+        self.targets_list.setUniformItemSizes(True)
         self.targets_list.setMaximumHeight(200)
-        self.targets_list.itemDoubleClicked.connect(self._on_edit_target)
+        self.targets_list.doubleClicked.connect(self._on_edit_target)
         layout.addWidget(self.targets_list)
         
         # Stats
@@ -54,71 +155,87 @@ class TargetBlock(QWidget):
             'boxes': 0
         }
         
-        self._update_display()
+        self._dirty_ids[target_id] = None
+        self._schedule_display()
         self.target_added.emit(name, quota or 0)
         return target_id
     
     def remove_target(self, target_id: int):
         """Remove a target class."""
         if target_id in self.targets:
-            del self.targets[target_id]
-            self._update_display()
+            removed = self.targets.pop(target_id)
+            self._total_images -= removed['images']
+            self._total_boxes -= removed['boxes']
+            self._dirty_ids[target_id] = None
+            self._schedule_display()
             self.target_removed.emit(target_id)
     
     def update_target_stats(self, target_id: int, images: int, boxes: int):
         """Update statistics for a target class."""
         if target_id in self.targets:
-            self.targets[target_id]['images'] = images
-            self.targets[target_id]['boxes'] = boxes
-            self._update_display()
+            target = self.targets[target_id]
+            self._total_images += images - target['images']
+            self._total_boxes += boxes - target['boxes']
+            target['images'] = images
+            target['boxes'] = boxes
+            self._dirty_ids[target_id] = None
+            self._schedule_display()
     
     def set_target_quota(self, target_id: int, quota: int):
         """Set quota for a target class."""
         if target_id in self.targets:
             self.targets[target_id]['quota'] = quota
-            self._update_display()
+            self._dirty_ids[target_id] = None
+            self._schedule_display()
             self.quota_changed.emit(target_id, quota)
     
     def get_targets(self) -> Dict[int, Dict[str, Any]]:
         """Get all target classes."""
         return self.targets.copy()
     
+    def _schedule_display(self):
+        """Coalesce display updates from a burst of changes into one pass on the next event-loop tick."""
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            QTimer.singleShot(0, self._flush_display)
+    
+    @Slot()
+    def _flush_display(self):
+        self._refresh_pending = False
+        self._update_display()
+    
     def _update_display(self):
         """Update the display with current target information."""
-        self.targets_list.clear()
-        
-        for target_id, target_info in sorted(self.targets.items()):
-            name = target_info['name']
-            quota = target_info['quota']
-            images = target_info['images']
-            boxes = target_info['boxes']
-            
-            quota_text = f" (quota: {quota})" if quota else " (unlimited)"
-            item_text = f"{name} [{target_id}]{quota_text}\n  {images} images, {boxes} boxes"
-            
-            item = QListWidgetItem(item_text)
-            item.setData(Qt.ItemDataRole.UserRole, target_id)
-            self.targets_list.addItem(item)
+        # new ids are touched in increasing order, so the model appends them in list order;
+        # existing rows are found through its id -> row map
+        for target_id in self._dirty_ids:
+            target_info = self.targets.get(target_id)
+            if target_info is None:
+                self.targets_model.remove_row(target_id)
+                continue
+            self.targets_model.set_row(target_id, target_info['name'], target_info['quota'],
+                                       target_info['images'], target_info['boxes'])
+        self._dirty_ids.clear()
         
         # Update stats
         total_targets = len(self.targets)
-        total_images = sum(t['images'] for t in self.targets.values())
-        total_boxes = sum(t['boxes'] for t in self.targets.values())
         
         if total_targets > 0:
-            self.stats_label.setText(f"{total_targets} targets, {total_images} images, {total_boxes} boxes")
+            self.stats_label.setText(f"{total_targets} targets, {self._total_images} images, {self._total_boxes} boxes")
         else:
             self.stats_label.setText("No targets defined")
     
+    @Slot()
     def _on_add_target(self):
         """Handle add target button click."""
         # This would typically open a dialog, for now just add a default target
         name = f"target_{self._next_id}"
         self.add_target(name)
     
-    def _on_edit_target(self, item: QListWidgetItem):
+    @Slot(QModelIndex)
+    def _on_edit_target(self, index: QModelIndex):
         """Handle double-click on target item."""
-        target_id = item.data(Qt.ItemDataRole.UserRole)
+        target_id = index.data(Qt.ItemDataRole.UserRole)
         if target_id is not None:
             # This would typically open an edit dialog
             print(f"Edit target {target_id}")
@@ -127,4 +244,8 @@ class TargetBlock(QWidget):
         """Clear all targets."""
         self.targets.clear()
         self._next_id = 0
+        self._dirty_ids.clear()
+        self._total_images = 0
+        self._total_boxes = 0
+        self.targets_model.clear()
         self._update_display()
@@ -1,6 +1,43 @@
 from __future__ import annotations
 from typing import Dict, List
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView, QGroupBox, QFormLayout
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QTableView, QHeaderView, QGroupBox, QFormLayout
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from .table_utils import frozen
+
+class ClassCountsModel(QAbstractTableModel):
+    """Class name/index and image count per class; cells are formatted on demand."""
+    HEADERS = ["Class", "#images"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._names: List[str] = []
+        self._counts: List[int] = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._names)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        i = index.row()
+        if index.column() == 0:
+            return f"{i}: {self._names[i]}"
+        return str(self._counts[i] if i < len(self._counts) else 0)
+
+    def set_counts(self, names: List[str], counts: List[int]):
+        self.beginResetModel()
+        self._names = names
+        self._counts = counts
+        self.endResetModel()
 
 class StatsPanel(QWidget):
     def __init__(self, parent=None):
@@ -14,24 +51,23 @@ class StatsPanel(QWidget):
         lay.addWidget(self.grp_split)
 
         self.grp_cls = QGroupBox("Class coverage (#images containing class)")
-        self.tbl_cls = QTableWidget(0, 2)
-        self.tbl_cls.setHorizontalHeaderLabels(["Class", "#images"])
+        self.cls_model = ClassCountsModel(self)
+        self.tbl_cls = QTableView()
+        self.tbl_cls.setModel(self.cls_model)
         self.tbl_cls.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         fc = QFormLayout(self.grp_cls); fc.addRow(self.tbl_cls)
         lay.addWidget(self.grp_cls)
         lay.addStretch(1)
 
     def set_split_counts(self, counts: Dict[str, int]):
-        self.tbl_split.setRowCount(0)
-        for s in ("train","val","test"):
-            if s not in counts: continue
-            r = self.tbl_split.rowCount(); self.tbl_split.insertRow(r)
-            self.tbl_split.setItem(r, 0, QTableWidgetItem(s))
-            self.tbl_split.setItem(r, 1, QTableWidgetItem(str(counts[s])))
+        splits = [s for s in ("train","val","test") if s in counts]
+        tbl = self.tbl_split
+        with frozen(tbl):
+            tbl.setRowCount(len(splits))
+            for r, s in enumerate(splits):
+                tbl.setItem(r, 0, QTableWidgetItem(s))
+                tbl.setItem(r, 1, QTableWidgetItem(str(counts[s])))
 
     def set_class_counts(self, names: List[str], counts: List[int]):
-        self.tbl_cls.setRowCount(0)
-        for i, n in enumerate(names):
-            r = self.tbl_cls.rowCount(); self.tbl_cls.insertRow(r)
-            self.tbl_cls.setItem(r, 0, QTableWidgetItem(f"{i}: {n}"))
-            self.tbl_cls.setItem(r, 1, QTableWidgetItem(str(counts[i] if i < len(counts) else 0)))
+        with frozen(self.tbl_cls):
+            self.cls_model.set_counts(names, counts)
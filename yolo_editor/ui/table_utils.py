@@ -0,0 +1,19 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from typing import Iterator
+from PySide6.QtWidgets import QAbstractItemView
+
+@contextmanager
+def frozen(tbl: QAbstractItemView) -> Iterator[QAbstractItemView]:
+    """Suspend signals, sorting and repaints of a table view for a bulk fill; repaint once on exit."""
+    blocked = tbl.blockSignals(True)
+    sorting = tbl.isSortingEnabled()
+    tbl.setSortingEnabled(False)
+    tbl.setUpdatesEnabled(False)
+    try:
+        yield tbl
+    finally:
+        tbl.setSortingEnabled(sorting)
+        tbl.setUpdatesEnabled(True)
+        tbl.blockSignals(blocked)
+        tbl.viewport().update()